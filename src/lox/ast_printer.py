@@ -1,39 +1,86 @@
+from typing import Callable, Dict, List
+
 from lox.expr import Binary, Call, Expr, ExprVisitor, Grouping, Literal, Unary
 
 
 class AstPrinter(ExprVisitor[str]):
+    def __init__(self) -> None:
+        self.builder: List[str] = []
+
     def print(self, expr: Expr) -> str:
         return expr.accept(self)
 
+    # Each visit_*() returns its node's whole text, like any ExprVisitor[str].
+    # The text itself is written by the _write_*() methods: every node appends
+    # its pieces to one shared buffer, which is joined once at the end, instead
+    # of each node building and joining its own string.
     def visit_call(self, expr: Call) -> str:
-        # Print function calls in prefix notation like:
-        # (call function_name arg1 arg2 ...)
-        # map() to apply self.print to each element in expr.arguments
-        args = " ".join(map(self.print, expr.arguments))
-        return f"(call {self.print(expr.callee)} {args})"
+        return self._render(self._write_call, expr)
 
     def visit_binary(self, expr: Binary) -> str:
-        return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
+        return self._render(self._write_binary, expr)
 
     def visit_grouping(self, expr: Grouping) -> str:
-        return self.parenthesize("group", expr.expression)
+        return self._render(self._write_grouping, expr)
 
     def visit_literal(self, expr: Literal) -> str:
-        if expr.value is None:
-            return "nil"
-        return str(expr.value)
+        return self._render(self._write_literal, expr)
 
     def visit_unary(self, expr: Unary) -> str:
-        return self.parenthesize(expr.operator.lexeme, expr.right)
+        return self._render(self._write_unary, expr)
 
-    def parenthesize(self, name: str, *exprs: Expr) -> str:
-        builder = []
-        builder.append("(")
-        builder.append(name)
+    def _render(self, write: Callable[[Expr], None], expr: Expr) -> str:
+        self.builder = []
+        write(expr)
+        return "".join(self.builder)
+
+    def _write(self, expr: Expr) -> None:
+        _WRITERS[type(expr)](self, expr)
+
+    def _write_call(self, expr: Call) -> None:
+        # Print function calls in prefix notation like:
+        # (call function_name arg1 arg2 ...)
+        self.builder.append("(call ")
+        self._write(expr.callee)
+        self.builder.append(" ")
+        for i, argument in enumerate(expr.arguments):
+            if i > 0:
+                self.builder.append(" ")
+            self._write(argument)
+        self.builder.append(")")
+
+    def _write_binary(self, expr: Binary) -> None:
+        self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
+
+    def _write_grouping(self, expr: Grouping) -> None:
+        self.parenthesize("group", expr.expression)
+
+    def _write_literal(self, expr: Literal) -> None:
+        if expr.value is None:
+            self.builder.append("nil")
+        else:
+            self.builder.append(str(expr.value))
+
+    def _write_unary(self, expr: Unary) -> None:
+        self.parenthesize(expr.operator.lexeme, expr.right)
+
+    def parenthesize(self, name: str, *exprs: Expr) -> None:
+        self.builder.append("(")
+        self.builder.append(name)
 
         for expr in exprs:
-            builder.append(" ")
-            builder.append(expr.accept(self))
+            self.builder.append(" ")
+            self._write(expr)
+
+        self.builder.append(")")
+
 
-        builder.append(")")
-        return "".join(builder)
+# Nested nodes are written through this table rather than accept(), which
+# would return (and so join) each subtree's text on the way back up
+_WRITERS: Dict[type, Callable[..., None]] = {
+    Call: AstPrinter._write_call,
+    Binary: AstPrinter._write_binary,
+    Grouping: AstPrinter._write_grouping,
+    Literal: AstPrinter._write_literal,
+    Unary: AstPrinter._write_unary,
+}
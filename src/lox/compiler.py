@@ -0,0 +1,380 @@
+from typing import Any, Final, List, Tuple
+
+from lox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    LogicalChain,
+    Unary,
+    Variable,
+)
+from lox.stmt import (
+    Block,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from lox.token import Token
+from lox.token_type import TokenType
+
+# Opcodes. Each instruction is an (opcode, argument) tuple; the comment after
+# each opcode says what its argument is. They're Final so that type checkers
+# (and compilers like mypyc) can treat them as constants.
+LOAD_CONST: Final = 0  # index into code.consts
+LOAD_GLOBAL: Final = 1  # index into code.names
+STORE_GLOBAL: Final = 2  # index into code.names; leaves the value on the stack
+DEFINE_GLOBAL: Final = 3  # index into code.names; pops the value
+POP: Final = 4  # no argument
+PRINT: Final = 5  # no argument
+ADD: Final = 6  # operator token, for error reporting
+SUBTRACT: Final = 7  # operator token
+MULTIPLY: Final = 8  # operator token
+DIVIDE: Final = 9  # operator token
+GREATER: Final = 10  # operator token
+GREATER_EQUAL: Final = 11  # operator token
+LESS: Final = 12  # operator token
+LESS_EQUAL: Final = 13  # operator token
+EQUAL: Final = 14  # no argument
+NOT_EQUAL: Final = 15  # no argument
+NEGATE: Final = 16  # operator token
+NOT: Final = 17  # no argument
+JUMP: Final = 18  # absolute target index
+POP_JUMP_IF_FALSE: Final = 19  # absolute target index
+JUMP_IF_FALSE_OR_POP: Final = 20  # absolute target index
+JUMP_IF_TRUE_OR_POP: Final = 21  # absolute target index
+CALL: Final = 22  # (argument count, closing paren token)
+MAKE_FUNCTION: Final = 23  # index into code.consts of a (Function, CodeObject) pair
+PUSH_SCOPE: Final = 24  # number of slots in the new scope
+POP_SCOPE: Final = 25  # no argument
+RETURN: Final = 26  # no argument
+LOAD_LOCAL: Final = 27  # slot in the current scope
+STORE_LOCAL: Final = 28  # slot in the current scope; leaves the value on the stack
+DEFINE_LOCAL: Final = 29  # slot in the current scope; pops the value
+# Arithmetic and comparisons on operands the compiler has proven are numbers,
+# which skip the operand type checks
+ADD_NUM: Final = 30  # no argument
+SUBTRACT_NUM: Final = 31  # no argument
+MULTIPLY_NUM: Final = 32  # no argument
+DIVIDE_NUM: Final = 33  # no argument
+GREATER_NUM: Final = 34  # no argument
+GREATER_EQUAL_NUM: Final = 35  # no argument
+LESS_NUM: Final = 36  # no argument
+LESS_EQUAL_NUM: Final = 37  # no argument
+LOAD_ENCLOSING: Final = 38  # (depth, slot), as resolved by the Resolver
+STORE_ENCLOSING: Final = 39  # (depth, slot); leaves the value on the stack
+# Compare the top two values and jump if the comparison is false, in one step.
+# Used for `if`/`while` conditions like i < n, instead of a comparison that
+# pushes a bool followed by a POP_JUMP_IF_FALSE that pops and tests it
+JUMP_IF_NOT_GREATER: Final = 40  # (absolute target index, operator token)
+JUMP_IF_NOT_GREATER_EQUAL: Final = 41  # (absolute target index, operator token)
+JUMP_IF_NOT_LESS: Final = 42  # (absolute target index, operator token)
+JUMP_IF_NOT_LESS_EQUAL: Final = 43  # (absolute target index, operator token)
+
+_BINARY_OPCODES = {
+    TokenType.PLUS: ADD,
+    TokenType.MINUS: SUBTRACT,
+    TokenType.STAR: MULTIPLY,
+    TokenType.SLASH: DIVIDE,
+    TokenType.GREATER: GREATER,
+    TokenType.GREATER_EQUAL: GREATER_EQUAL,
+    TokenType.LESS: LESS,
+    TokenType.LESS_EQUAL: LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: EQUAL,
+    TokenType.BANG_EQUAL: NOT_EQUAL,
+}
+
+_NUMBER_OPCODES = {
+    ADD: ADD_NUM,
+    SUBTRACT: SUBTRACT_NUM,
+    MULTIPLY: MULTIPLY_NUM,
+    DIVIDE: DIVIDE_NUM,
+    GREATER: GREATER_NUM,
+    GREATER_EQUAL: GREATER_EQUAL_NUM,
+    LESS: LESS_NUM,
+    LESS_EQUAL: LESS_EQUAL_NUM,
+}
+
+_COMPARE_JUMP_OPCODES = {
+    TokenType.GREATER: JUMP_IF_NOT_GREATER,
+    TokenType.GREATER_EQUAL: JUMP_IF_NOT_GREATER_EQUAL,
+    TokenType.LESS: JUMP_IF_NOT_LESS,
+    TokenType.LESS_EQUAL: JUMP_IF_NOT_LESS_EQUAL,
+}
+
+
+class CodeObject:
+    """
+    A compiled script or function body: a flat list of instructions plus the
+    constants and names they refer to by index.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ops: List[Tuple[int, Any]] = []
+        self.consts: List[Any] = []
+        # Names are stored as Tokens rather than strings so that the VM can
+        # report "Undefined variable" errors with a line number.
+        self.names: List[Token] = []
+
+
+class Compiler(ExprVisitor[None], StmtVisitor[None]):
+    """
+    Compiles a list of statements into a CodeObject, once, so the interpreter
+    doesn't have to re-walk the syntax tree every time a loop body or function
+    runs.
+
+    The statements must already have been resolved (see Resolver): local
+    variables compile to slot accesses, and everything else is looked up by
+    name in the globals.
+    """
+
+    def __init__(self, name: str = "<script>"):
+        self.code = CodeObject(name)
+
+    def compile(self, statements: List[Stmt]) -> CodeObject:
+        for statement in statements:
+            statement.accept(self)
+        # Falling off the end of a script or function returns nil
+        self._emit(LOAD_CONST, self._add_const(None))
+        self._emit(RETURN)
+        return self.code
+
+    def visit_expression_stmt(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+        self._emit(POP)
+
+    def visit_print_stmt(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+        self._emit(PRINT)
+
+    def visit_var_stmt(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        else:
+            self._emit(LOAD_CONST, self._add_const(None))
+        self._define(stmt.name, stmt.slot)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self._emit(PUSH_SCOPE, stmt.slot_count)
+        for statement in stmt.statements:
+            statement.accept(self)
+        self._emit(POP_SCOPE)
+
+    def visit_if_stmt(self, stmt: If) -> None:
+        # condition
+        # POP_JUMP_IF_FALSE else
+        # then_branch
+        # JUMP end
+        # else: else_branch
+        # end:
+        if isinstance(stmt.condition, Literal):
+            # The ConstantFolder left a condition that's known ahead of time,
+            # so only the branch that would run is compiled
+            if _is_truthy(stmt.condition.value):
+                stmt.then_branch.accept(self)
+            elif stmt.else_branch is not None:
+                stmt.else_branch.accept(self)
+            return
+
+        jump_to_else = self._condition_jump(stmt.condition)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is None:
+            self._patch(jump_to_else)
+            return
+        jump_to_end = self._emit(JUMP)
+        self._patch(jump_to_else)
+        stmt.else_branch.accept(self)
+        self._patch(jump_to_end)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        # start: condition
+        # POP_JUMP_IF_FALSE end
+        # body
+        # JUMP start
+        # end:
+        start = len(self.code.ops)
+        if isinstance(stmt.condition, Literal):
+            # A constant condition is either never true, or always true and so
+            # needn't be tested (e.g. a `for (;;)` loop)
+            if _is_truthy(stmt.condition.value):
+                stmt.body.accept(self)
+                self._emit(JUMP, start)
+            return
+
+        exit_jump = self._condition_jump(stmt.condition)
+        stmt.body.accept(self)
+        self._emit(JUMP, start)
+        self._patch(exit_jump)
+
+    def visit_function_stmt(self, stmt: Function) -> None:
+        code = Compiler(stmt.name.lexeme).compile(stmt.body)
+        self._emit(MAKE_FUNCTION, self._add_const((stmt, code)))
+        self._define(stmt.name, stmt.slot)
+
+    def visit_return_stmt(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value.accept(self)
+        else:
+            self._emit(LOAD_CONST, self._add_const(None))
+        self._emit(RETURN)
+
+    def visit_literal(self, expr: Literal) -> None:
+        self._emit(LOAD_CONST, self._add_const(expr.value))
+
+    def visit_grouping(self, expr: Grouping) -> None:
+        # Groupings only exist to steer the parser, so they compile to nothing
+        expr.expression.accept(self)
+
+    def visit_unary(self, expr: Unary) -> None:
+        expr.right.accept(self)
+        if expr.operator.type == TokenType.MINUS:
+            self._emit(NEGATE, expr.operator)
+        else:  # TokenType.BANG
+            self._emit(NOT)
+
+    def visit_binary(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+        opcode = _BINARY_OPCODES[expr.operator.type]
+        if (
+            opcode in _NUMBER_OPCODES
+            and _is_number(expr.left)
+            and _is_number(expr.right)
+        ):
+            self._emit(_NUMBER_OPCODES[opcode])
+        else:
+            self._emit(opcode, expr.operator)
+
+    def visit_logical(self, expr: Logical) -> None:
+        # The left operand stays on the stack as the result if it short
+        # circuits, otherwise it's popped and the right operand takes its place
+        expr.left.accept(self)
+        if expr.operator.type == TokenType.OR:
+            end_jump = self._emit(JUMP_IF_TRUE_OR_POP)
+        else:  # TokenType.AND
+            end_jump = self._emit(JUMP_IF_FALSE_OR_POP)
+        expr.right.accept(self)
+        self._patch(end_jump)
+
+    def visit_logical_chain(self, expr: LogicalChain) -> None:
+        # Like visit_logical(), but every short circuit jumps straight to the
+        # end of the chain
+        if expr.operator.type == TokenType.OR:
+            jump = JUMP_IF_TRUE_OR_POP
+        else:  # TokenType.AND
+            jump = JUMP_IF_FALSE_OR_POP
+        end_jumps = []
+        for operand in expr.operands[:-1]:
+            operand.accept(self)
+            end_jumps.append(self._emit(jump))
+        expr.operands[-1].accept(self)
+        for end_jump in end_jumps:
+            self._patch(end_jump)
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        if expr.depth is None:
+            self._emit(LOAD_GLOBAL, self._add_name(expr.name))
+        elif expr.depth == 0:
+            self._emit(LOAD_LOCAL, expr.slot)
+        else:
+            self._emit(LOAD_ENCLOSING, (expr.depth, expr.slot))
+
+    def visit_assign_expr(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        if expr.depth is None:
+            self._emit(STORE_GLOBAL, self._add_name(expr.name))
+        elif expr.depth == 0:
+            self._emit(STORE_LOCAL, expr.slot)
+        else:
+            self._emit(STORE_ENCLOSING, (expr.depth, expr.slot))
+
+    def visit_call(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+        self._emit(CALL, (len(expr.arguments), expr.paren))
+
+    def _emit(self, opcode: int, argument: Any = None) -> int:
+        """Append an instruction and return its index, for later patching."""
+        self.code.ops.append((opcode, argument))
+        return len(self.code.ops) - 1
+
+    def _condition_jump(self, condition: Expr) -> int:
+        """
+        Compile a branch condition followed by a jump, to be patched, that's
+        taken when the condition is falsey. Returns the jump's index.
+        """
+        if (
+            isinstance(condition, Binary)
+            and condition.operator.type in _COMPARE_JUMP_OPCODES
+        ):
+            condition.left.accept(self)
+            condition.right.accept(self)
+            return self._emit(
+                _COMPARE_JUMP_OPCODES[condition.operator.type],
+                (None, condition.operator),
+            )
+        condition.accept(self)
+        return self._emit(POP_JUMP_IF_FALSE)
+
+    def _patch(self, index: int) -> None:
+        """Point the jump at index to the next instruction to be emitted."""
+        opcode, argument = self.code.ops[index]
+        if isinstance(argument, tuple):
+            # A compare-and-jump, which also carries its operator token
+            self.code.ops[index] = (opcode, (len(self.code.ops), argument[1]))
+        else:
+            self.code.ops[index] = (opcode, len(self.code.ops))
+
+    def _define(self, name: Token, slot: int | None) -> None:
+        if slot is None:
+            self._emit(DEFINE_GLOBAL, self._add_name(name))
+        else:
+            self._emit(DEFINE_LOCAL, slot)
+
+    def _add_const(self, value: Any) -> int:
+        self.code.consts.append(value)
+        return len(self.code.consts) - 1
+
+    def _add_name(self, name: Token) -> int:
+        self.code.names.append(name)
+        return len(self.code.names) - 1
+
+
+def _is_number(expr: Expr) -> bool:
+    """
+    Whether expr is statically known to produce a number (if it produces a
+    value at all, rather than raising a runtime error).
+    """
+    if isinstance(expr, Literal):
+        return isinstance(expr.value, float)
+    if isinstance(expr, Grouping):
+        return _is_number(expr.expression)
+    if isinstance(expr, Unary):
+        return expr.operator.type == TokenType.MINUS
+    if isinstance(expr, Binary):
+        if expr.operator.type == TokenType.PLUS:
+            # Could also be string concatenation
+            return _is_number(expr.left) and _is_number(expr.right)
+        return expr.operator.type in (
+            TokenType.MINUS,
+            TokenType.STAR,
+            TokenType.SLASH,
+        )
+    return False
+
+
+def _is_truthy(obj: Any) -> bool:
+    # Same rule as Interpreter._is_truthy(), for conditions known at compile time
+    return obj is not None and obj is not False
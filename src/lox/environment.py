@@ -1,11 +1,25 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from lox.token import Token
 
 
 class Environment:
-    def __init__(self, enclosing: "Environment | None" = None):
-        self.values: Dict[str, Any] = {}
+    """
+    A scope at runtime.
+
+    Global variables live in the values dict, keyed by name. Local variables
+    have been resolved to a slot index ahead of time (see Resolver), so local
+    scopes keep them in the slots list instead, and they are found with
+    get_at()/assign_at() rather than by name. A local scope only gets a values
+    dict if something is defined in it by name, which resolved programs never
+    do, so entering a block or calling a function allocates just the list.
+    """
+
+    __slots__ = ("values", "slots", "enclosing")
+
+    def __init__(self, enclosing: "Environment | None" = None, slot_count: int = 0):
+        self.values: Dict[str, Any] | None = {} if enclosing is None else None
+        self.slots: List[Any] = [None] * slot_count
         self.enclosing = enclosing
 
     # define() always creates/updates a variable in the current scope, without
@@ -19,28 +33,46 @@ class Environment:
     #   answer = 70;      // Uses assign() -- updates inner x
     # }
     def define(self, name: str, value: Any) -> None:
+        if self.values is None:
+            self.values = {}
         self.values[name] = value
 
+    # get() and assign() walk the chain iteratively rather than recursing into
+    # enclosing scopes. Since variables are resolved, they're only used for
+    # globals, so the walk normally ends at the first scope it checks.
     def get(self, name: Token) -> Any:
-        if name.lexeme in self.values:
-            return self.values[name.lexeme]
-
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
+        environment: Environment | None = self
+        while environment is not None:
+            values = environment.values
+            if values is not None and name.lexeme in values:
+                return values[name.lexeme]
+            environment = environment.enclosing
 
         from lox.interpreter import RuntimeError
 
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
 
     def assign(self, name: Token, value: Any) -> None:
-        if name.lexeme in self.values:
-            self.values[name.lexeme] = value
-            return
-
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
+        environment: Environment | None = self
+        while environment is not None:
+            values = environment.values
+            if values is not None and name.lexeme in values:
+                values[name.lexeme] = value
+                return
+            environment = environment.enclosing
 
         from lox.interpreter import RuntimeError
 
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+
+    def ancestor(self, depth: int) -> "Environment":
+        environment = self
+        for _ in range(depth):
+            environment = environment.enclosing
+        return environment
+
+    def get_at(self, depth: int, slot: int) -> Any:
+        return self.ancestor(depth).slots[slot]
+
+    def assign_at(self, depth: int, slot: int, value: Any) -> None:
+        self.ancestor(depth).slots[slot] = value
@@ -9,12 +9,19 @@ R = TypeVar("R")
 
 # Jupiter; the Platonic ideal to inherit from
 class Expr(ABC):
+    # Every node class declares __slots__, so nodes don't each carry a __dict__.
+    # Programs can have thousands of nodes, and __slots__ attributes are also
+    # faster to read than dict entries.
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: "ExprVisitor[R]") -> R:
         pass
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -27,6 +34,8 @@ class Binary(Expr):
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -36,7 +45,26 @@ class Logical(Expr):
         return visitor.visit_logical(self)
 
 
+class LogicalChain(Expr):
+    """
+    A run of three or more operands joined by the same logical operator, e.g.
+    a or b or c. Evaluated with one loop instead of a nested Logical per
+    operator.
+    """
+
+    __slots__ = ("operator", "operands")
+
+    def __init__(self, operator: Token, operands: List[Expr]):
+        self.operator = operator
+        self.operands = operands
+
+    def accept(self, visitor: "ExprVisitor[R]") -> R:
+        return visitor.visit_logical_chain(self)
+
+
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -45,6 +73,8 @@ class Grouping(Expr):
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: Any):
         self.value = value
 
@@ -53,6 +83,8 @@ class Literal(Expr):
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -62,23 +94,35 @@ class Unary(Expr):
 
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot")
+
     def __init__(self, name: Token):
         self.name = name
+        # Filled in by the Resolver; depth None means the variable is global
+        self.depth: int | None = None
+        self.slot: int | None = None
 
     def accept(self, visitor: "ExprVisitor[R]") -> R:
         return visitor.visit_variable_expr(self)
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "depth", "slot")
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
+        # Filled in by the Resolver; depth None means the variable is global
+        self.depth: int | None = None
+        self.slot: int | None = None
 
     def accept(self, visitor: "ExprVisitor[R]") -> R:
         return visitor.visit_assign_expr(self)
 
 
 class Call(Expr):
+    __slots__ = ("callee", "paren", "arguments")
+
     def __init__(self, callee: Expr, paren: Token, arguments: List[Expr]):
         self.callee = callee
         self.paren = paren
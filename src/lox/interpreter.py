@@ -1,6 +1,54 @@
 import time
-from typing import Any, List
-
+from typing import Any, Callable, Dict, List
+
+from lox.compiler import (
+    ADD,
+    ADD_NUM,
+    CALL,
+    DEFINE_GLOBAL,
+    DEFINE_LOCAL,
+    DIVIDE,
+    DIVIDE_NUM,
+    EQUAL,
+    GREATER,
+    GREATER_EQUAL,
+    GREATER_EQUAL_NUM,
+    GREATER_NUM,
+    JUMP,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_NOT_GREATER,
+    JUMP_IF_NOT_GREATER_EQUAL,
+    JUMP_IF_NOT_LESS,
+    JUMP_IF_NOT_LESS_EQUAL,
+    JUMP_IF_TRUE_OR_POP,
+    LESS,
+    LESS_EQUAL,
+    LESS_EQUAL_NUM,
+    LESS_NUM,
+    LOAD_CONST,
+    LOAD_ENCLOSING,
+    LOAD_GLOBAL,
+    LOAD_LOCAL,
+    MAKE_FUNCTION,
+    MULTIPLY,
+    MULTIPLY_NUM,
+    NEGATE,
+    NOT,
+    NOT_EQUAL,
+    POP,
+    POP_JUMP_IF_FALSE,
+    POP_SCOPE,
+    PRINT,
+    PUSH_SCOPE,
+    RETURN,
+    STORE_ENCLOSING,
+    STORE_GLOBAL,
+    STORE_LOCAL,
+    SUBTRACT,
+    SUBTRACT_NUM,
+    CodeObject,
+    Compiler,
+)
 from lox.environment import Environment
 from lox.expr import (
     Assign,
@@ -11,10 +59,13 @@ from lox.expr import (
     Grouping,
     Literal,
     Logical,
+    LogicalChain,
     Unary,
     Variable,
 )
 from lox.lox_callable import LoxCallable, LoxFunction, Return
+from lox.optimizer import ConstantFolder
+from lox.resolver import Resolver
 from lox.stmt import (
     Block,
     Expression,
@@ -26,9 +77,14 @@ from lox.stmt import (
     Var,
     While,
 )
+from lox.stmt import Return as ReturnStmt
 from lox.token import Token
 from lox.token_type import TokenType
 
+# Bound once so the logical operator visitors compare against a module global
+# with `is`, instead of looking the member up on TokenType on every visit
+_OR = TokenType.OR
+
 
 class RuntimeError(Exception):
     """Lox runtime error with associated token for error reporting."""
@@ -38,34 +94,335 @@ class RuntimeError(Exception):
         self.token = token
 
 
-class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
-    """Evaluates Lox expressions."""
+class ClockFunction(LoxCallable):
+    """The native clock() function: seconds since the epoch."""
 
-    def __init__(self):
-        self.globals = Environment()
-        self.environment = self.globals
+    def call(self, interpreter: "Interpreter", arguments: List[Any]) -> float:
+        return time.time()
+
+    def arity(self) -> int:
+        return 0
 
-        class ClockFunction(LoxCallable):
-            def call(self, interpreter: Interpreter, arguments: List[Any]) -> float:
-                return float(time.time())
+    def __str__(self) -> str:
+        return "<native fn>"
 
-            def arity(self) -> int:
-                return 0
 
-            def __str__(self) -> str:
-                return "<native fn>"
+class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
+    """
+    Evaluates Lox programs.
 
+    interpret() folds a program's constant expressions, resolves its variables,
+    compiles it to bytecode once and runs it in a single dispatch loop (run()).
+    The visit_* methods are the original tree-walking evaluator, kept as a
+    fallback: _evaluate() and _execute() still work on any resolved syntax
+    tree, and functions declared through them are executed by walking their
+    bodies.
+    """
+
+    def __init__(self):
+        self.globals: Environment = Environment()
+        self.environment: Environment = self.globals
         self.globals.define("clock", ClockFunction())
 
+        # The tree-walker dispatches operators through these tables: one dict
+        # lookup and call instead of testing a match statement case by case
+        self._unary_handlers: Dict[TokenType, Callable[[Token, Any], Any]] = {
+            TokenType.MINUS: self._negate,
+            TokenType.BANG: self._not,
+        }
+        self._binary_handlers: Dict[TokenType, Callable[[Token, Any, Any], Any]] = {
+            TokenType.PLUS: self._add,
+            TokenType.MINUS: self._subtract,
+            TokenType.STAR: self._multiply,
+            TokenType.SLASH: self._divide,
+            TokenType.GREATER: self._greater,
+            TokenType.GREATER_EQUAL: self._greater_equal,
+            TokenType.LESS: self._less,
+            TokenType.LESS_EQUAL: self._less_equal,
+            TokenType.EQUAL_EQUAL: self._equal,
+            TokenType.BANG_EQUAL: self._not_equal,
+        }
+
+        # _evaluate() and _execute() look up the visit method by node type
+        # directly, skipping the extra call through each node's accept()
+        self._expr_dispatch: Dict[type, Callable[[Any], Any]] = {
+            Literal: self.visit_literal,
+            Variable: self.visit_variable_expr,
+            Binary: self.visit_binary,
+            Call: self.visit_call,
+            Assign: self.visit_assign_expr,
+            Logical: self.visit_logical,
+            LogicalChain: self.visit_logical_chain,
+            Grouping: self.visit_grouping,
+            Unary: self.visit_unary,
+        }
+        self._stmt_dispatch: Dict[type, Callable[[Any], None]] = {
+            Expression: self.visit_expression_stmt,
+            Block: self.visit_block_stmt,
+            If: self.visit_if_stmt,
+            While: self.visit_while_stmt,
+            Var: self.visit_var_stmt,
+            Print: self.visit_print_stmt,
+            ReturnStmt: self.visit_return_stmt,
+            Function: self.visit_function_stmt,
+        }
+
     def interpret(self, statements: List[Stmt]) -> None:
         try:
-            for statement in statements:
-                self._execute(statement)
+            ConstantFolder().fold(statements)
+            Resolver().resolve(statements)
+            code = Compiler().compile(statements)
+            self.run(code, self.environment)
         except RuntimeError as error:
             from lox.lox import Lox
 
             Lox.runtime_error(error)
 
+    def run(self, code: CodeObject, environment: Environment) -> Any:
+        """
+        Execute compiled code in the given environment.
+
+        Returns:
+            The value of the RETURN instruction that ended execution.
+        """
+        # Hoist everything the loop touches into locals; local variable
+        # lookups are much cheaper than attribute lookups in CPython.
+        ops = code.ops
+        consts = code.consts
+        names = code.names
+        # Globals are read and written straight from the dict, skipping the
+        # Environment method calls
+        global_values = self.globals.values
+        # The current scope's variables, which most local accesses hit
+        slots = environment.slots
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+
+        # Opcodes are tested roughly in order of how often they run
+        while True:
+            op, arg = ops[ip]
+            ip += 1
+
+            if op == LOAD_LOCAL:
+                push(slots[arg])
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == LOAD_GLOBAL:
+                try:
+                    push(global_values[names[arg].lexeme])
+                except KeyError:
+                    name = names[arg]
+                    raise RuntimeError(
+                        name, f"Undefined variable '{name.lexeme}'."
+                    ) from None
+            elif op == LOAD_ENCLOSING:
+                depth, slot = arg
+                scope = environment.enclosing
+                while depth > 1:
+                    scope = scope.enclosing
+                    depth -= 1
+                push(scope.slots[slot])
+            elif op == STORE_LOCAL:
+                slots[arg] = stack[-1]
+            elif op == STORE_ENCLOSING:
+                depth, slot = arg
+                scope = environment.enclosing
+                while depth > 1:
+                    scope = scope.enclosing
+                    depth -= 1
+                scope.slots[slot] = stack[-1]
+            elif op == STORE_GLOBAL:
+                name = names[arg]
+                if name.lexeme not in global_values:
+                    raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
+                global_values[name.lexeme] = stack[-1]
+            elif op == POP:
+                pop()
+            elif op == ADD:
+                right = pop()
+                left = stack[-1]
+                # Handle both number addition and string concatenation
+                if (type(left) is float and type(right) is float) or (
+                    type(left) is str and type(right) is str
+                ):
+                    stack[-1] = left + right
+                else:
+                    raise RuntimeError(
+                        arg, "Operands must be two numbers or two strings."
+                    )
+            elif op == SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left - right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == JUMP_IF_NOT_LESS:
+                right = pop()
+                left = pop()
+                if type(left) is not float or type(right) is not float:
+                    raise RuntimeError(arg[1], "Operands must be numbers.")
+                if not left < right:
+                    ip = arg[0]
+            elif op == JUMP_IF_NOT_LESS_EQUAL:
+                right = pop()
+                left = pop()
+                if type(left) is not float or type(right) is not float:
+                    raise RuntimeError(arg[1], "Operands must be numbers.")
+                if not left <= right:
+                    ip = arg[0]
+            elif op == LESS:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left < right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == POP_JUMP_IF_FALSE:
+                # _is_truthy() inlined: only nil and false are falsey
+                value = pop()
+                if value is None or value is False:
+                    ip = arg
+            elif op == JUMP:
+                ip = arg
+            elif op == CALL:
+                # The arguments are the top arg_count values, with the callee
+                # just below them. Slice them off and drop all of it at once.
+                arg_count, paren = arg
+                start = len(stack) - arg_count
+                callee = stack[start - 1]
+                arguments = stack[start:]
+                del stack[start - 1 :]
+
+                if not isinstance(callee, LoxCallable):
+                    raise RuntimeError(paren, "Can only call functions and classes.")
+                if arg_count != callee.arity():
+                    raise RuntimeError(
+                        paren,
+                        f"Expected {callee.arity()} arguments but got {arg_count}.",
+                    )
+
+                push(callee.call(self, arguments))
+            elif op == RETURN:
+                return pop()
+            elif op == MULTIPLY:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left * right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == DIVIDE:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left / right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == LESS_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left <= right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == GREATER:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left > right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == GREATER_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is float and type(right) is float:
+                    stack[-1] = left >= right
+                else:
+                    raise RuntimeError(arg, "Operands must be numbers.")
+            elif op == ADD_NUM:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif op == SUBTRACT_NUM:
+                right = pop()
+                stack[-1] -= right
+            elif op == MULTIPLY_NUM:
+                right = pop()
+                stack[-1] *= right
+            elif op == DIVIDE_NUM:
+                right = pop()
+                stack[-1] /= right
+            elif op == LESS_NUM:
+                right = pop()
+                stack[-1] = stack[-1] < right
+            elif op == LESS_EQUAL_NUM:
+                right = pop()
+                stack[-1] = stack[-1] <= right
+            elif op == GREATER_NUM:
+                right = pop()
+                stack[-1] = stack[-1] > right
+            elif op == GREATER_EQUAL_NUM:
+                right = pop()
+                stack[-1] = stack[-1] >= right
+            elif op == JUMP_IF_NOT_GREATER:
+                right = pop()
+                left = pop()
+                if type(left) is not float or type(right) is not float:
+                    raise RuntimeError(arg[1], "Operands must be numbers.")
+                if not left > right:
+                    ip = arg[0]
+            elif op == JUMP_IF_NOT_GREATER_EQUAL:
+                right = pop()
+                left = pop()
+                if type(left) is not float or type(right) is not float:
+                    raise RuntimeError(arg[1], "Operands must be numbers.")
+                if not left >= right:
+                    ip = arg[0]
+            elif op == EQUAL:
+                # Python's == already gives Lox equality (see _is_equal())
+                right = pop()
+                stack[-1] = stack[-1] == right
+            elif op == NOT_EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] != right
+            elif op == JUMP_IF_FALSE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = arg
+                else:
+                    pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    pop()
+                else:
+                    ip = arg
+            elif op == NEGATE:
+                value = stack[-1]
+                if type(value) is not float:
+                    raise RuntimeError(arg, "Operand must be a number.")
+                stack[-1] = -value
+            elif op == NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+            elif op == PRINT:
+                print(self._stringify(pop()))
+            elif op == DEFINE_LOCAL:
+                slots[arg] = pop()
+            elif op == DEFINE_GLOBAL:
+                global_values[names[arg].lexeme] = pop()
+            elif op == PUSH_SCOPE:
+                environment = Environment(environment, arg)
+                slots = environment.slots
+            elif op == POP_SCOPE:
+                environment = environment.enclosing
+                slots = environment.slots
+            elif op == MAKE_FUNCTION:
+                declaration, function_code = consts[arg]
+                push(LoxFunction(declaration, environment, function_code))
+
     def visit_literal(self, expr: Literal) -> Any:
         """Return the literal's value directly."""
         return expr.value
@@ -80,15 +437,27 @@ class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
         # is returned
         # AND: if left is false, right no longer needs to be evaluated, and left
         # is returned
-        if expr.operator.type == TokenType.OR:
-            if self._is_truthy(left):
+        left_is_truthy = left is not None and left is not False
+        if expr.operator.type is _OR:
+            if left_is_truthy:
                 return left
         else:  # TokenType.AND
-            if not self._is_truthy(left):
+            if not left_is_truthy:
                 return left
 
         return self._evaluate(expr.right)
 
+    def visit_logical_chain(self, expr: LogicalChain) -> Any:
+        """Evaluate a run of the same logical operator in one loop."""
+        short_circuits_on = expr.operator.type is _OR
+        operands = expr.operands
+        evaluate = self._evaluate
+        for i in range(len(operands) - 1):
+            value = evaluate(operands[i])
+            if (value is not None and value is not False) == short_circuits_on:
+                return value
+        return evaluate(operands[-1])
+
     def visit_grouping(self, expr: Grouping) -> Any:
         """Evaluate the expression inside the grouping."""
         return self._evaluate(expr.expression)
@@ -96,75 +465,117 @@ class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
     def visit_unary(self, expr: Unary) -> Any:
         """Evaluate unary operations (-, !)."""
         right = self._evaluate(expr.right)
-
-        match expr.operator.type:
-            case TokenType.MINUS:
-                self._check_number_operand(expr.operator, right)
-                return -float(right)
-            case TokenType.BANG:
-                return not self._is_truthy(right)
-
-        # Unreachable
-        return None
+        return self._unary_handlers[expr.operator.type](expr.operator, right)
 
     def visit_binary(self, expr: Binary) -> Any:
         """Evaluate binary operations (+, -, *, /, >, >=, <, <=, ==, !=)."""
-        left = self._evaluate(expr.left)
-        right = self._evaluate(expr.right)
+        # Dispatch the operands here rather than through _evaluate(), saving a
+        # call per operand on the most common node type
+        dispatch = self._expr_dispatch
+        left = expr.left
+        right = expr.right
+        left = dispatch[type(left)](left)
+        right = dispatch[type(right)](right)
+        return self._binary_handlers[expr.operator.type](expr.operator, left, right)
+
+    # Operator handlers for visit_unary() and visit_binary(). Each one checks
+    # its own operand types inline and takes the operator token for error
+    # reporting. The checks use `type(x) is float` rather than isinstance():
+    # Lox numbers are always exactly float, so no subclass check is needed.
+    def _negate(self, operator: Token, right: Any) -> float:
+        if type(right) is float:
+            return -right
+        raise RuntimeError(operator, "Operand must be a number.")
 
-        match expr.operator.type:
-            case TokenType.GREATER:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) > float(right)
-            case TokenType.GREATER_EQUAL:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) >= float(right)
-            case TokenType.LESS:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) < float(right)
-            case TokenType.LESS_EQUAL:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) <= float(right)
-            case TokenType.BANG_EQUAL:
-                return not self._is_equal(left, right)
-            case TokenType.EQUAL_EQUAL:
-                return self._is_equal(left, right)
-            case TokenType.MINUS:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) - float(right)
-            case TokenType.PLUS:
-                # Handle both number addition and string concatenation
-                if isinstance(left, float) and isinstance(right, float):
-                    return left + right
-                if isinstance(left, str) and isinstance(right, str):
-                    return left + right
-                raise RuntimeError(
-                    expr.operator, "Operands must be two numbers or two strings."
-                )
-            case TokenType.SLASH:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) / float(right)
-            case TokenType.STAR:
-                self._check_number_operands(expr.operator, left, right)
-                return float(left) * float(right)
-
-        # Unreachable
-        return None
+    def _not(self, operator: Token, right: Any) -> bool:
+        # not _is_truthy(right), inlined
+        return right is None or right is False
+
+    def _add(self, operator: Token, left: Any, right: Any) -> float | str:
+        # Handle both number addition and string concatenation
+        if type(left) is float and type(right) is float:
+            return left + right
+        if type(left) is str and type(right) is str:
+            return left + right
+        raise RuntimeError(operator, "Operands must be two numbers or two strings.")
+
+    def _subtract(self, operator: Token, left: Any, right: Any) -> float:
+        if type(left) is float and type(right) is float:
+            return left - right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _multiply(self, operator: Token, left: Any, right: Any) -> float:
+        if type(left) is float and type(right) is float:
+            return left * right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _divide(self, operator: Token, left: Any, right: Any) -> float:
+        if type(left) is float and type(right) is float:
+            return left / right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _greater(self, operator: Token, left: Any, right: Any) -> bool:
+        if type(left) is float and type(right) is float:
+            return left > right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _greater_equal(self, operator: Token, left: Any, right: Any) -> bool:
+        if type(left) is float and type(right) is float:
+            return left >= right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _less(self, operator: Token, left: Any, right: Any) -> bool:
+        if type(left) is float and type(right) is float:
+            return left < right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _less_equal(self, operator: Token, left: Any, right: Any) -> bool:
+        if type(left) is float and type(right) is float:
+            return left <= right
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+    def _equal(self, operator: Token, left: Any, right: Any) -> bool:
+        return left == right
+
+    def _not_equal(self, operator: Token, left: Any, right: Any) -> bool:
+        return left != right
 
     def visit_variable_expr(self, expr: Variable) -> Any:
-        return self.environment.get(expr.name)
+        # The same lookups as the VM's LOAD_GLOBAL/LOAD_LOCAL: one dict probe
+        # for a global, one list index for a variable in the current scope
+        depth = expr.depth
+        if depth is None:
+            try:
+                return self.globals.values[expr.name.lexeme]
+            except KeyError:
+                raise RuntimeError(
+                    expr.name, f"Undefined variable '{expr.name.lexeme}'."
+                ) from None
+        if depth == 0:
+            return self.environment.slots[expr.slot]
+        return self.environment.get_at(depth, expr.slot)
 
     def visit_assign_expr(self, expr: Assign) -> Any:
         value = self._evaluate(expr.value)
-        self.environment.assign(expr.name, value)
+        depth = expr.depth
+        if depth is None:
+            global_values = self.globals.values
+            if expr.name.lexeme not in global_values:
+                raise RuntimeError(
+                    expr.name, f"Undefined variable '{expr.name.lexeme}'."
+                )
+            global_values[expr.name.lexeme] = value
+        elif depth == 0:
+            self.environment.slots[expr.slot] = value
+        else:
+            self.environment.assign_at(depth, expr.slot, value)
         return value
 
     def visit_call(self, expr: Call) -> Any:
         callee = self._evaluate(expr.callee)
 
-        arguments = []
-        for argument in expr.arguments:
-            arguments.append(self._evaluate(argument))
+        evaluate = self._evaluate
+        arguments = [evaluate(argument) for argument in expr.arguments]
 
         if not isinstance(callee, LoxCallable):
             raise RuntimeError(expr.paren, "Can only call functions and classes.")
@@ -180,10 +591,10 @@ class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
 
     def visit_function_stmt(self, stmt: Function) -> None:
         function = LoxFunction(stmt, self.environment)
-        self.environment.define(stmt.name.lexeme, function)
+        self._define(stmt.name, stmt.slot, function)
         return None
 
-    def visit_return_stmt(self, stmt: Return) -> None:
+    def visit_return_stmt(self, stmt: ReturnStmt) -> None:
         value = None
         if stmt.value is not None:
             value = self._evaluate(stmt.value)
@@ -193,7 +604,8 @@ class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
         self._evaluate(stmt.expression)
 
     def visit_if_stmt(self, stmt: If) -> None:
-        if self._is_truthy(self._evaluate(stmt.condition)):
+        value = self._evaluate(stmt.condition)
+        if value is not None and value is not False:
             self._execute(stmt.then_branch)
         elif stmt.else_branch is not None:
             self._execute(stmt.else_branch)
@@ -207,69 +619,76 @@ class Interpreter(ExprVisitor[Any], StmtVisitor[None]):
         value = None
         if stmt.initializer is not None:
             value = self._evaluate(stmt.initializer)
-        self.environment.define(stmt.name.lexeme, value)
+        self._define(stmt.name, stmt.slot, value)
 
     def visit_while_stmt(self, stmt: While) -> None:
-        while self._is_truthy(self._evaluate(stmt.condition)):
-            self._execute(stmt.body)
+        condition = stmt.condition
+        body = stmt.body
+        # Bind everything the loop uses to locals, since it runs on every
+        # iteration. _is_truthy() is inlined too: only nil and false are falsey.
+        evaluate = self._expr_dispatch[type(condition)]
+        execute = self._stmt_dispatch[type(body)]
+        while (value := evaluate(condition)) is not None and value is not False:
+            execute(body)
 
     def visit_block_stmt(self, stmt: Block) -> None:
-        self._execute_block(stmt.statements, Environment(self.environment))
+        self._execute_block(
+            stmt.statements, Environment(self.environment, stmt.slot_count)
+        )
 
     def _execute_block(self, statements: List[Stmt], environment: Environment) -> None:
         previous = self.environment
         try:
             self.environment = environment
+            dispatch = self._stmt_dispatch
             for statement in statements:
-                self._execute(statement)
+                dispatch[type(statement)](statement)
         finally:
             self.environment = previous
 
+    def _define(self, name: Token, slot: int | None, value: Any) -> None:
+        if slot is None:
+            self.environment.define(name.lexeme, value)
+        else:
+            self.environment.slots[slot] = value
+
     def _execute(self, stmt: Stmt) -> None:
-        stmt.accept(self)
+        self._stmt_dispatch[type(stmt)](stmt)
 
     def _evaluate(self, expr: Expr) -> Any:
-        return expr.accept(self)
+        return self._expr_dispatch[type(expr)](expr)
 
     def _is_truthy(self, obj: Any) -> bool:
-        # None and False are falsey, everything else is truthy.
-        if obj is None:
-            return False
-        if isinstance(obj, bool):
-            return obj
-        return True
+        # None and False are falsey, everything else is truthy. The hot paths
+        # (conditions, logical operators, !) inline this expression.
+        return obj is not None and obj is not False
 
     def _is_equal(self, a: Any, b: Any) -> bool:
-        # None is only equal to None
-        if a is None and b is None:
-            return True
-        if a is None:
-            return False
+        # None is only equal to None, which is exactly what Python's == does
+        # for every kind of Lox value, so no special case is needed. The hot
+        # paths use == directly; this stays as the named definition.
         return a == b
 
-    def _check_number_operand(self, operator: Token, operand: Any) -> None:
-        if isinstance(operand, float):
-            return
-        raise RuntimeError(operator, "Operand must be a number.")
-
-    def _check_number_operands(self, operator: Token, left: Any, right: Any) -> None:
-        if isinstance(left, float) and isinstance(right, float):
-            return
-        raise RuntimeError(operator, "Operands must be numbers.")
-
     def _stringify(self, obj: None | float | bool | str) -> str:
         if obj is None:
             return "nil"
 
-        if isinstance(obj, float):
+        # Exact type checks: bool isn't a float subclass, and Lox values are
+        # never instances of subclasses
+        if obj is True:
+            return "true"
+        if obj is False:
+            return "false"
+
+        if type(obj) is float:
+            # Show integer values without decimal point. Zero is excluded
+            # because int() would drop the sign of -0, and so are magnitudes
+            # from 1e16 up, which str() prints with an exponent (1e+16).
+            if obj and -1e16 < obj < 1e16 and obj.is_integer():
+                return str(int(obj))
             text = str(obj)
-            # Show integer values without decimal point
             if text.endswith(".0"):
                 text = text[:-2]
             return text
 
-        if isinstance(obj, bool):
-            # str(True) evaluates to "True"
-            return str(obj).lower()
-
         return obj  # must be str at this point
@@ -7,7 +7,9 @@ from lox.scanner import Scanner
 
 
 class Lox:
-    interpreter = Interpreter()
+    # Created by get_interpreter() on first use, so runs that stop at a syntax
+    # error (or never run anything) don't pay for setting one up
+    _interpreter: Interpreter | None = None
     had_error = False
     had_runtime_error = False
 
@@ -53,6 +55,13 @@ class Lox:
         print(f"[line {line}] Error{where}: {message}", file=sys.stderr)
         cls.had_error = True
 
+    @classmethod
+    def get_interpreter(cls) -> Interpreter:
+        """Return the interpreter shared by every run, creating it if needed."""
+        if cls._interpreter is None:
+            cls._interpreter = Interpreter()
+        return cls._interpreter
+
 
 def run_file(path: str) -> None:
     """Execute Lox script from a file."""
@@ -90,7 +99,7 @@ def run(source: str) -> None:
 
     # Execute statements if parsing succeeded
     if statements:
-        Lox.interpreter.interpret(statements)
+        Lox.get_interpreter().interpret(statements)
 
 
 def main() -> None:
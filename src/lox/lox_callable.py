@@ -1,9 +1,25 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, Dict, List, Tuple
 
+from lox.compiler import CodeObject
 from lox.environment import Environment
 from lox.stmt import Function
 
+# Results of pure functions are cached for arguments of these types, keyed by
+# their reprs. Keys can't be the values themselves, since Python considers
+# true == 1 and -0 == 0, and Lox functions can tell those apart. Other values
+# (functions) aren't cached, as their reprs are only unique while they're alive.
+_MEMO_TYPES = (float, str, bool, type(None))
+_MEMO_SIZE = 4096
+# Caching makes a pure function's repeated calls nearly free, which changes
+# what programs that time themselves with clock() measure (e.g. a recursive
+# fib benchmark). So it's opt-in: run with LOX_MEMOIZE=1 to turn it on.
+_MEMOIZE = os.environ.get("LOX_MEMOIZE") == "1"
+# Most finished call scopes a function keeps for reuse. Deep recursion needs
+# more scopes than that at once, but it shouldn't keep them all afterwards.
+_FRAMES_SIZE = 64
+
 
 class LoxCallable(ABC):
     @abstractmethod
@@ -25,22 +41,85 @@ class Return(Exception):
 
 
 class LoxFunction(LoxCallable):
-    def __init__(self, declaration: Function, closure: Environment):
+    def __init__(
+        self,
+        declaration: Function,
+        closure: Environment,
+        code: CodeObject | None = None,
+    ):
         self.declaration = declaration
         self.closure = closure
+        # The compiled body, if this function was created by the bytecode
+        # interpreter. Functions created by the tree-walker have none and
+        # execute their declaration's body directly.
+        self.code = code
+        # Scopes of finished calls, reused by later calls instead of allocating
+        # new ones. That's only safe if nothing can hold on to a scope after
+        # its call returns, i.e. no closure is declared inside the function.
+        self.frames: List[Environment] | None = None if declaration.has_closures else []
+        # Cached results of calls, for functions the Resolver found to be pure.
+        # Ordered from least to most recently used.
+        self.memo: Dict[Tuple[str, ...], Any] | None = (
+            {} if _MEMOIZE and declaration.is_pure else None
+        )
 
     def call(self, interpreter, arguments: List[Any]) -> Any:
-        environment = Environment(self.closure)
+        memo = self.memo
+        if (
+            memo is not None
+            and self._is_bound_to_own_name()
+            and all(type(argument) in _MEMO_TYPES for argument in arguments)
+        ):
+            key = tuple(map(repr, arguments))
+            if key in memo:
+                # Move the hit to the most recently used end
+                result = memo[key] = memo.pop(key)
+                return result
+            result = self._call(interpreter, arguments)
+            if len(memo) >= _MEMO_SIZE:
+                # Evict the least recently used result
+                del memo[next(iter(memo))]
+            memo[key] = result
+            return result
+
+        return self._call(interpreter, arguments)
+
+    def _call(self, interpreter, arguments: List[Any]) -> Any:
+        # Parameters occupy the first slots of the call's scope, followed by
+        # the body's local variables. Scopes go back into the pool with all
+        # their slots cleared, and every local is defined before it's read.
+        frames = self.frames
+        if frames:
+            environment = frames.pop()
+        else:
+            environment = Environment(self.closure, self.declaration.slot_count)
+        environment.slots[: len(arguments)] = arguments
 
-        for i in range(len(self.declaration.params)):
-            environment.define(self.declaration.params[i].lexeme, arguments[i])
+        if self.code is not None:
+            result = interpreter.run(self.code, environment)
+        else:
+            result = None
+            try:
+                interpreter._execute_block(self.declaration.body, environment)
+            except Return as return_value:
+                result = return_value.value
 
-        try:
-            interpreter._execute_block(self.declaration.body, environment)
-        except Return as return_value:
-            return return_value.value
+        if frames is not None and len(frames) < _FRAMES_SIZE:
+            # Don't keep the finished call's arguments and locals alive
+            slots = environment.slots
+            slots[:] = [None] * len(slots)
+            frames.append(environment)
+        return result
 
-        return None
+    def _is_bound_to_own_name(self) -> bool:
+        # A pure function may call itself through its name. If the name now
+        # refers to something else, calls made through another reference can
+        # return something different from before, so the cache can't be used.
+        declaration = self.declaration
+        if declaration.slot is None:
+            values = self.closure.values
+            return values is not None and values.get(declaration.name.lexeme) is self
+        return self.closure.slots[declaration.slot] is self
 
     def arity(self) -> int:
         return len(self.declaration.params)
@@ -0,0 +1,193 @@
+from typing import Any, List
+
+from lox.expr import (
+    Assign,
+    Binary,
+    Call,
+    Expr,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    LogicalChain,
+    Unary,
+    Variable,
+)
+from lox.stmt import (
+    Block,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from lox.token_type import TokenType
+
+
+class ConstantFolder(ExprVisitor[Expr], StmtVisitor[None]):
+    """
+    Replaces pure subexpressions (ones built only from literals) with a single
+    Literal holding their value, so that e.g. the `2 * 3` in a loop body is
+    computed once before the program runs instead of on every iteration. A
+    logical operator whose left operand is constant is replaced by whichever
+    operand it would produce, and Grouping nodes are replaced by the expression
+    they group.
+
+    Expression visitors return the (possibly new) node, and parents store it
+    back in place of the old child. Anything that would raise a runtime error
+    (e.g. -"a") is left alone so the error is still reported when and where the
+    program actually runs it.
+    """
+
+    def fold(self, statements: List[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def visit_expression_stmt(self, stmt: Expression) -> None:
+        stmt.expression = stmt.expression.accept(self)
+
+    def visit_print_stmt(self, stmt: Print) -> None:
+        stmt.expression = stmt.expression.accept(self)
+
+    def visit_var_stmt(self, stmt: Var) -> None:
+        if stmt.initializer is not None:
+            stmt.initializer = stmt.initializer.accept(self)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self.fold(stmt.statements)
+
+    def visit_if_stmt(self, stmt: If) -> None:
+        stmt.condition = stmt.condition.accept(self)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        stmt.condition = stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    def visit_function_stmt(self, stmt: Function) -> None:
+        self.fold(stmt.body)
+
+    def visit_return_stmt(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value = stmt.value.accept(self)
+
+    def visit_literal(self, expr: Literal) -> Expr:
+        return expr
+
+    def visit_grouping(self, expr: Grouping) -> Expr:
+        # Parentheses only steer the parser, which has already built the
+        # grouped expression as one subtree. Later passes and the interpreter
+        # can use that subtree directly.
+        return expr.expression.accept(self)
+
+    def visit_unary(self, expr: Unary) -> Expr:
+        expr.right = expr.right.accept(self)
+        if not isinstance(expr.right, Literal):
+            return expr
+
+        right = expr.right.value
+        if expr.operator.type == TokenType.BANG:
+            return Literal(not _is_truthy(right))
+        if isinstance(right, float):  # TokenType.MINUS
+            return Literal(-right)
+        return expr
+
+    def visit_binary(self, expr: Binary) -> Expr:
+        expr.left = expr.left.accept(self)
+        expr.right = expr.right.accept(self)
+        if not (isinstance(expr.left, Literal) and isinstance(expr.right, Literal)):
+            return expr
+
+        left = expr.left.value
+        right = expr.right.value
+        match expr.operator.type:
+            case TokenType.EQUAL_EQUAL:
+                return Literal(left == right)
+            case TokenType.BANG_EQUAL:
+                return Literal(left != right)
+            case TokenType.PLUS if isinstance(left, str) and isinstance(right, str):
+                return Literal(left + right)
+
+        if not (isinstance(left, float) and isinstance(right, float)):
+            return expr
+
+        match expr.operator.type:
+            case TokenType.PLUS:
+                return Literal(left + right)
+            case TokenType.MINUS:
+                return Literal(left - right)
+            case TokenType.STAR:
+                return Literal(left * right)
+            case TokenType.SLASH if right != 0:
+                return Literal(left / right)
+            case TokenType.GREATER:
+                return Literal(left > right)
+            case TokenType.GREATER_EQUAL:
+                return Literal(left >= right)
+            case TokenType.LESS:
+                return Literal(left < right)
+            case TokenType.LESS_EQUAL:
+                return Literal(left <= right)
+
+        return expr
+
+    def visit_logical(self, expr: Logical) -> Expr:
+        expr.left = expr.left.accept(self)
+        expr.right = expr.right.accept(self)
+        if not isinstance(expr.left, Literal):
+            return expr
+
+        # A constant left operand decides the short circuit ahead of time:
+        # either it's the result, or the right operand is
+        left_is_truthy = _is_truthy(expr.left.value)
+        if expr.operator.type == TokenType.OR:
+            return expr.left if left_is_truthy else expr.right
+        # TokenType.AND
+        return expr.right if left_is_truthy else expr.left
+
+    def visit_logical_chain(self, expr: LogicalChain) -> Expr:
+        short_circuits_on = expr.operator.type == TokenType.OR
+        last = len(expr.operands) - 1
+        operands: List[Expr] = []
+        for i, operand in enumerate(expr.operands):
+            operand = operand.accept(self)
+            operands.append(operand)
+            if isinstance(operand, Literal):
+                if _is_truthy(operand.value) == short_circuits_on:
+                    # Always short circuits here: nothing after it can run
+                    break
+                if i != last:
+                    # Never short circuits and isn't last, so it can't be the
+                    # result either
+                    operands.pop()
+
+        if len(operands) == 1:
+            return operands[0]
+        if len(operands) == 2:
+            return Logical(operands[0], expr.operator, operands[1])
+        expr.operands = operands
+        return expr
+
+    def visit_variable_expr(self, expr: Variable) -> Expr:
+        return expr
+
+    def visit_assign_expr(self, expr: Assign) -> Expr:
+        expr.value = expr.value.accept(self)
+        return expr
+
+    def visit_call(self, expr: Call) -> Expr:
+        expr.callee = expr.callee.accept(self)
+        expr.arguments = [argument.accept(self) for argument in expr.arguments]
+        return expr
+
+
+# This mirrors Interpreter._is_truthy(), which can't be imported from here
+# without a circular import.
+def _is_truthy(obj: Any) -> bool:
+    return obj is not None and obj is not False
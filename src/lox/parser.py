@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from lox.expr import (
     Assign,
@@ -8,6 +8,7 @@ from lox.expr import (
     Grouping,
     Literal,
     Logical,
+    LogicalChain,
     Unary,
     Variable,
 )
@@ -15,6 +16,61 @@ from lox.stmt import Block, Expression, Function, If, Print, Return, Stmt, Var,
 from lox.token import Token
 from lox.token_type import TokenType
 
+# Literal nodes are never modified once built, so every nil/true/false in a
+# program can share one node, and so can repeated number and string literals
+# (see Parser._literal()).
+NIL = Literal(None)
+TRUE = Literal(True)
+FALSE = Literal(False)
+
+# How tightly each binary operator binds: equality, then comparison, then
+# term, then factor. Parser._binary() climbs these instead of recursing
+# through a method per level.
+_BINARY_PRECEDENCE = {
+    TokenType.BANG_EQUAL: 1,
+    TokenType.EQUAL_EQUAL: 1,
+    TokenType.GREATER: 2,
+    TokenType.GREATER_EQUAL: 2,
+    TokenType.LESS: 2,
+    TokenType.LESS_EQUAL: 2,
+    TokenType.MINUS: 3,
+    TokenType.PLUS: 3,
+    TokenType.SLASH: 4,
+    TokenType.STAR: 4,
+}
+# Keywords that start a declaration or statement, where synchronize() can
+# resume parsing after an error
+_STATEMENT_KEYWORDS = frozenset(
+    (
+        TokenType.CLASS,
+        TokenType.FUN,
+        TokenType.VAR,
+        TokenType.FOR,
+        TokenType.IF,
+        TokenType.WHILE,
+        TokenType.PRINT,
+        TokenType.RETURN,
+    )
+)
+_UNARY_OPERATORS = frozenset((TokenType.BANG, TokenType.MINUS))
+# Token types the parser tests for at nearly every token, bound once as module
+# globals. Reading a member off TokenType goes through the enum's metaclass and
+# costs over ten times as much as reading a global.
+_AND = TokenType.AND
+_COMMA = TokenType.COMMA
+_EOF = TokenType.EOF
+_EQUAL = TokenType.EQUAL
+_FUN = TokenType.FUN
+_IDENTIFIER = TokenType.IDENTIFIER
+_LEFT_PAREN = TokenType.LEFT_PAREN
+_NUMBER = TokenType.NUMBER
+_OR = TokenType.OR
+_RIGHT_BRACE = TokenType.RIGHT_BRACE
+_RIGHT_PAREN = TokenType.RIGHT_PAREN
+_SEMICOLON = TokenType.SEMICOLON
+_STRING = TokenType.STRING
+_VAR = TokenType.VAR
+
 
 class ParseError(Exception):
     """Custom exception"""
@@ -61,9 +117,14 @@ class Parser:
                 | "(" expression ")" | IDENTIFIER;
     """
 
+    # Every method reads self.tokens and self.current, which are a little
+    # cheaper to get at as slots than through an instance __dict__
+    __slots__ = ("tokens", "current", "literals")
+
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.current = 0
+        self.literals: Dict[Any, Literal] = {}
 
     def parse(self) -> List[Stmt]:
         """
@@ -73,10 +134,12 @@ class Parser:
         """
         # This is intended to be Parser's only public method
         statements: List[Stmt] = []
-        while not self.isAtEnd():
+        append = statements.append
+        tokens = self.tokens
+        while tokens[self.current].type is not _EOF:
             decl = self.declaration()
             if decl is not None:
-                statements.append(decl)
+                append(decl)
         return statements
 
     def declaration(self) -> Optional[Stmt]:
@@ -86,78 +149,81 @@ class Parser:
         # print x;    // we still want this line to execute, so synchronize
         #                after the previous parse error
         try:
-            if self.match(TokenType.FUN):
+            token_type = self.tokens[self.current].type
+            if token_type is _FUN:
+                self.current += 1
                 return self.function("function")
-            if self.match(TokenType.VAR):
+            if token_type is _VAR:
+                self.current += 1
                 return self.var_declaration()
 
             # If not a function or a variable declaration, try a statement
-            return self.statement()
+            # (statement() inlined, since nearly every declaration is one)
+            parse = _STATEMENT_PARSERS.get(token_type)
+            if parse is not None:
+                self.current += 1
+                return parse(self)
+            return self.expression_statement()
         except ParseError:
             self.synchronize()
             return None
 
     def var_declaration(self) -> Stmt:
-        name = self.consume(TokenType.IDENTIFIER, "Expect variable name.")
+        name = self.consume(_IDENTIFIER, "Expect variable name.")
 
-        # (Optional) variable initialization
+        # (Optional) variable initialization, with match() inlined
         initializer = None
-        if self.match(TokenType.EQUAL):
+        if self.tokens[self.current].type is _EQUAL:
+            self.current += 1
             initializer = self.expression()
 
-        self.consume(TokenType.SEMICOLON, "Expect ';' after variable declaration.")
+        self.consume(_SEMICOLON, "Expect ';' after variable declaration.")
         return Var(name, initializer)
 
     def while_statement(self):
-        self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
+        self.consume(_LEFT_PAREN, "Expect '(' after 'while'.")
         condition = self.expression()
-        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
+        self.consume(_RIGHT_PAREN, "Expect ')' after condition.")
         body = self.statement()
 
         return While(condition, body)
 
     def statement(self) -> Stmt:
-        # Statements are either...
-        # ... for...
-        if self.match(TokenType.FOR):
-            return self.for_statement()
-        # ... if...
-        if self.match(TokenType.IF):
-            return self.if_statement()
-        # ... print...
-        if self.match(TokenType.PRINT):
-            return self.print_statement()
-        # ... return...
-        if self.match(TokenType.RETURN):
-            return self.return_statement()
-        # ... while...
-        if self.match(TokenType.WHILE):
-            return self.while_statement()
-        # ... block...
-        if self.match(TokenType.LEFT_BRACE):
-            return Block(self.block())
-        # ... or expression
+        # Statements are either for, if, print, return, while or block
+        # statements, which start with a keyword or brace that picks their
+        # parsing method from _STATEMENT_PARSERS...
+        parse = _STATEMENT_PARSERS.get(self.tokens[self.current].type)
+        if parse is not None:
+            self.current += 1
+            return parse(self)
+        # ... or expression statements
         return self.expression_statement()
 
+    def block_statement(self) -> Stmt:
+        return Block(self.block())
+
     def function(self, kind: str) -> Function:
-        name = self.consume(TokenType.IDENTIFIER, f"Expect {kind} name.")
+        name = self.consume(_IDENTIFIER, f"Expect {kind} name.")
 
-        self.consume(TokenType.LEFT_PAREN, f"Expect '(' after {kind} name.")
-        parameters = []
+        self.consume(_LEFT_PAREN, f"Expect '(' after {kind} name.")
+        parameters: List[Token] = []
 
-        if not self.check(TokenType.RIGHT_PAREN):
+        tokens = self.tokens
+        if tokens[self.current].type is not _RIGHT_PAREN:
+            append = parameters.append
             while True:
                 if len(parameters) >= 255:
-                    self.error(self.peek(), "Can't have more than 255 parameters.")
+                    self.error(
+                        tokens[self.current], "Can't have more than 255 parameters."
+                    )
 
-                parameters.append(
-                    self.consume(TokenType.IDENTIFIER, "Expect parameter name.")
-                )
+                append(self.consume(_IDENTIFIER, "Expect parameter name."))
 
-                if not self.match(TokenType.COMMA):
+                if tokens[self.current].type is not _COMMA:
                     break
+                self.current += 1
 
-        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after parameters.")
+        self.consume(_RIGHT_PAREN, "Expect ')' after parameters.")
 
         self.consume(TokenType.LEFT_BRACE, f"Expect '{{' before {kind} body.")
         body = self.block()
@@ -166,19 +232,19 @@ class Parser:
     def return_statement(self) -> Stmt:
         keyword = self.previous()
         value = None
-        if not self.check(TokenType.SEMICOLON):
+        if not self.check(_SEMICOLON):
             value = self.expression()
 
-        self.consume(TokenType.SEMICOLON, "Expect ';' after return value.")
+        self.consume(_SEMICOLON, "Expect ';' after return value.")
         return Return(keyword, value)
 
     def for_statement(self) -> Stmt:
-        self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
+        self.consume(_LEFT_PAREN, "Expect '(' after 'for'.")
 
-        if self.match(TokenType.SEMICOLON):
+        if self.match(_SEMICOLON):
             # Initializer has been omitted
             initializer = None
-        elif self.match(TokenType.VAR):
+        elif self.match(_VAR):
             # Initializer is a variable
             initializer = self.var_declaration()
         else:
@@ -186,12 +252,12 @@ class Parser:
             initializer = self.expression_statement()
 
         # If the next token is a semicolon, the condition has been omitted
-        condition = self.expression() if not self.check(TokenType.SEMICOLON) else None
-        self.consume(TokenType.SEMICOLON, "Expect ';' after loop condition.")
+        condition = self.expression() if not self.check(_SEMICOLON) else None
+        self.consume(_SEMICOLON, "Expect ';' after loop condition.")
 
         # If the next token is a right paren, the increment has been omitted
-        increment = self.expression() if not self.check(TokenType.RIGHT_PAREN) else None
-        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after loop condition.")
+        increment = self.expression() if not self.check(_RIGHT_PAREN) else None
+        self.consume(_RIGHT_PAREN, "Expect ')' after loop condition.")
 
         body = self.statement()
 
@@ -199,7 +265,7 @@ class Parser:
         if increment is not None:
             body = Block([body, Expression(increment)])
         if condition is None:
-            condition = Literal(True)
+            condition = TRUE
         body = While(condition, body)
         if initializer is not None:
             body = Block([initializer, body])
@@ -207,32 +273,42 @@ class Parser:
         return body
 
     def if_statement(self) -> Stmt:
-        self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
+        self.consume(_LEFT_PAREN, "Expect '(' after 'if'.")
         condition = self.expression()
-        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
+        self.consume(_RIGHT_PAREN, "Expect ')' after if condition.")
 
         then_branch = self.statement()
-        else_branch = self.statement() if self.match(TokenType.ELSE) else None
+        else_branch: Optional[Stmt] = None
+        if self.tokens[self.current].type is TokenType.ELSE:
+            self.current += 1
+            else_branch = self.statement()
 
         return If(condition, then_branch, else_branch)
 
     def print_statement(self) -> Stmt:
         value = self.expression()
-        self.consume(TokenType.SEMICOLON, "Expect ';' after value.")
+        self.consume(_SEMICOLON, "Expect ';' after value.")
         return Print(value)
 
     def block(self) -> List[Stmt]:
         statements: List[Stmt] = []
+        append = statements.append
 
-        while not self.check(TokenType.RIGHT_BRACE) and not self.isAtEnd():
-            statements.append(self.declaration())
+        tokens = self.tokens
+        while (token_type := tokens[self.current].type) is not _RIGHT_BRACE:
+            if token_type is _EOF:
+                break
+            # Like parse(), leave out declarations that failed to parse
+            decl = self.declaration()
+            if decl is not None:
+                append(decl)
 
-        self.consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
+        self.consume(_RIGHT_BRACE, "Expect '}' after block.")
         return statements
 
     def expression_statement(self) -> Stmt:
         expr = self.expression()
-        self.consume(TokenType.SEMICOLON, "Expect ';' after expression.")
+        self.consume(_SEMICOLON, "Expect ';' after expression.")
         return Expression(expr)
 
     def expression(self) -> Expr:
@@ -243,15 +319,26 @@ class Parser:
         """="""
         expr = self.logical_or()
 
-        if self.match(TokenType.EQUAL):
-            equals = self.previous()
-            value = self.assignment()
+        tokens = self.tokens
+        if tokens[self.current].type is not _EQUAL:
+            return expr
 
-            if isinstance(expr, Variable):
-                name = expr.name
-                return Assign(name, value)
+        # Assignment is right-associative: a = b = c assigns c to b, then the
+        # result to a. Rather than recursing once per "=", collect the targets
+        # in a loop and build the Assigns from the right.
+        targets: List[Tuple[Expr, Token]] = []
+        while (equals := tokens[self.current]).type is _EQUAL:
+            self.current += 1
+            targets.append((expr, equals))
+            expr = self.logical_or()
 
-            self.error(equals, "Invalid assignment target.")
+        for target, equals in reversed(targets):
+            # Variable has no subclasses, so an exact type check is enough
+            if type(target) is Variable:
+                expr = Assign(target.name, expr)
+            else:
+                self.error(equals, "Invalid assignment target.")
+                expr = target
 
         return expr
 
@@ -262,148 +349,181 @@ class Parser:
         # or?
         expr = self.logical_and()
 
-        while self.match(TokenType.OR):
-            op = self.previous()
-            right = self.logical_and()
-            expr = Logical(expr, op, right)
+        # match() and previous() inlined. Most expressions have no "or", and
+        # return here without building an operand list.
+        tokens = self.tokens
+        op = tokens[self.current]
+        if op.type is not _OR:
+            return expr
 
-        return expr
+        operands = [expr]
+        while tokens[self.current].type is _OR:
+            self.current += 1
+            operands.append(self.logical_and())
+
+        return self._logical(operands, op)
 
     def logical_and(self) -> Expr:
         """and"""
-        expr = self.equality()
+        expr = self._binary(1)
 
-        while self.match(TokenType.AND):
-            op = self.previous()
-            right = self.equality()
-            expr = Logical(expr, op, right)
+        # match() and previous() inlined. Most expressions have no "and", and
+        # return here without building an operand list.
+        tokens = self.tokens
+        op = tokens[self.current]
+        if op.type is not _AND:
+            return expr
 
-        return expr
-
-    def equality(self) -> Expr:
-        """==, !="""
-        expr = self.comparison()
-
-        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
-
-        return expr
-
-    def comparison(self) -> Expr:
-        """>, >=, <, <="""
-        expr = self.term()
-
-        while self.match(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
-
-        return expr
+        operands = [expr]
+        while tokens[self.current].type is _AND:
+            self.current += 1
+            operands.append(self._binary(1))
 
-    def term(self) -> Expr:
-        """+, -"""
-        expr = self.factor()
+        return self._logical(operands, op)
 
-        while self.match(TokenType.MINUS, TokenType.PLUS):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
+    def _logical(self, operands: List[Expr], op: Token) -> Expr:
+        # Longer runs of the same operator become a single flat node rather
+        # than a left-leaning tree of Logicals
+        if len(operands) == 2:
+            return Logical(operands[0], op, operands[1])
+        return LogicalChain(op, operands)
 
-        return expr
-
-    def factor(self) -> Expr:
-        """*, /"""
-        expr = self.unary()
+    def _binary(self, min_precedence: int) -> Expr:
+        """
+        Parse a run of binary operators binding at least as tightly as
+        min_precedence, by precedence climbing: the right operand of each
+        operator only takes operators that bind tighter than it, which makes
+        every level left-associative. This builds the same tree as a method
+        per grammar level (equality -> comparison -> term -> factor -> unary
+        -> call), but parses an operand with one call instead of six.
+        """
+        # unary() and call() inlined for the operand
+        tokens = self.tokens
+        operator = tokens[self.current]
+        if operator.type in _UNARY_OPERATORS:
+            expr: Expr = self.unary()
+        else:
+            expr = self.primary()
+            while tokens[self.current].type is _LEFT_PAREN:
+                self.current += 1
+                expr = self.finish_call(expr)
 
-        while self.match(TokenType.SLASH, TokenType.STAR):
-            operator = self.previous()
-            right = self.unary()
+        while True:
+            operator = tokens[self.current]
+            precedence = _BINARY_PRECEDENCE.get(operator.type)
+            if precedence is None or precedence < min_precedence:
+                return expr
+            self.current += 1
+            right = self._binary(precedence + 1)
             expr = Binary(expr, operator, right)
 
-        return expr
-
     def unary(self) -> Expr:
         """! or -"""
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator = self.previous()
-            right = self.unary()
-            return Unary(operator, right)
+        # Like assignment, unary operators nest to the right. Collect a run of
+        # them in a loop, then wrap the operand from the innermost outwards.
+        tokens = self.tokens
+        operators: List[Token] = []
+        while (operator := tokens[self.current]).type in _UNARY_OPERATORS:
+            self.current += 1
+            operators.append(operator)
 
-        return self.call()
+        expr = self.call()
+        for operator in reversed(operators):
+            expr = Unary(operator, expr)
+        return expr
 
     def call(self) -> Expr:
         expr = self.primary()
 
-        while True:
-            if self.match(TokenType.LEFT_PAREN):
-                expr = self.finish_call(expr)
-            else:
-                break
+        tokens = self.tokens
+        while tokens[self.current].type is _LEFT_PAREN:
+            self.current += 1
+            expr = self.finish_call(expr)
 
         return expr
 
     def finish_call(self, callee: Expr) -> Expr:
-        arguments = []
-        if not self.check(TokenType.RIGHT_PAREN):
+        arguments: List[Expr] = []
+        tokens = self.tokens
+        if tokens[self.current].type is not _RIGHT_PAREN:
+            append = arguments.append
             while True:
                 if len(arguments) >= 255:
-                    self.error(self.peek(), "Can't have more than 255 arguments.")
-                arguments.append(self.expression())
-                if not self.match(TokenType.COMMA):
+                    self.error(
+                        tokens[self.current], "Can't have more than 255 arguments."
+                    )
+                append(self.expression())
+                if tokens[self.current].type is not _COMMA:
                     break
+                self.current += 1
 
-        paren = self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
+        paren = self.consume(_RIGHT_PAREN, "Expect ')' after arguments.")
 
         return Call(callee, paren, arguments)
 
     def primary(self) -> Expr:
         """literals, parentheses"""
-        if self.match(TokenType.FALSE):
-            return Literal(False)
-        if self.match(TokenType.TRUE):
-            return Literal(True)
-        if self.match(TokenType.NIL):
-            return Literal(None)
+        # Read the token once and test the common cases first, rather than
+        # calling match() for each kind of primary in turn
+        token = self.tokens[self.current]
+        token_type = token.type
 
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self.previous().literal)
+        if token_type is _IDENTIFIER:
+            self.current += 1
+            return Variable(token)
 
-        if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous())
+        if token_type is _NUMBER or token_type is _STRING:
+            self.current += 1
+            return self._literal(token.literal)
 
-        if self.match(TokenType.LEFT_PAREN):
+        if token_type is TokenType.FALSE:
+            self.current += 1
+            return FALSE
+        if token_type is TokenType.TRUE:
+            self.current += 1
+            return TRUE
+        if token_type is TokenType.NIL:
+            self.current += 1
+            return NIL
+
+        if token_type is _LEFT_PAREN:
+            self.current += 1
             expr = self.expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+            self.consume(_RIGHT_PAREN, "Expect ')' after expression.")
             return Grouping(expr)
 
-        raise self.error(self.peek(), "Expect expression.")
+        raise self.error(token, "Expect expression.")
+
+    def _literal(self, value: float | str) -> Literal:
+        # Only numbers and strings are cached here, so keys like 1.0 and True
+        # (which are equal in Python) can't collide
+        literal = self.literals.get(value)
+        if literal is None:
+            literal = self.literals[value] = Literal(value)
+        return literal
 
     def match(self, *token_types: TokenType) -> bool:
         """Consumes token if check succeeds"""
-        for token_type in token_types:
-            if self.check(token_type):
-                self.advance()
-                return True
+        # check() and advance() inlined, since this runs at every precedence
+        # level for every token. Nothing ever matches EOF, so the current
+        # token's type being one of token_types also means it isn't EOF.
+        if self.tokens[self.current].type in token_types:
+            self.current += 1
+            return True
         return False
 
     def consume(self, token_type: TokenType, message: str) -> Token:
-        if self.check(token_type):
-            return self.advance()
+        token = self.tokens[self.current]
+        if token.type is token_type:
+            self.current += 1
+            return token
 
         raise self.error(self.peek(), message)
 
     def check(self, token_type: TokenType) -> bool:
         """Doesn't consume token if check succeeds"""
-        if self.isAtEnd():
-            return False
-        return self.peek().type == token_type
+        # Like match(), relies on token_type never being EOF
+        return self.tokens[self.current].type is token_type
 
     def advance(self) -> Token:
         """Consume the current token and return it."""
@@ -416,7 +536,7 @@ class Parser:
         Returns:
             True if at end of input, False otherwise
         """
-        return self.peek().type == TokenType.EOF
+        return self.tokens[self.current].type is _EOF
 
     def peek(self) -> Token:
         """Return the current token without consuming it."""
@@ -433,24 +553,20 @@ class Parser:
         """
         self.advance()
 
-        while not self.isAtEnd():
-            if self.previous().type == TokenType.SEMICOLON:
-                return
+        # Nothing here calls other parser methods, so the position can live in
+        # a local until the loop is done
+        tokens = self.tokens
+        current = self.current
+        while tokens[current].type is not _EOF:
+            if tokens[current - 1].type is _SEMICOLON:
+                break
 
             # Don't try to catch expression or block statements
-            if self.peek().type in {
-                TokenType.CLASS,
-                TokenType.FUN,
-                TokenType.VAR,
-                TokenType.FOR,
-                TokenType.IF,
-                TokenType.WHILE,
-                TokenType.PRINT,
-                TokenType.RETURN,
-            }:
-                return
-
-            self.advance()
+            if tokens[current].type in _STATEMENT_KEYWORDS:
+                break
+
+            current += 1
+        self.current = current
 
     def error(self, token: Token, message: str) -> ParseError:
         """
@@ -467,8 +583,20 @@ class Parser:
         # Python caches imports after the first time anyway.
         from lox.lox import Lox
 
-        if token.type == TokenType.EOF:
+        if token.type is _EOF:
             Lox.report(token.line, " at end", message)
         else:
             Lox.report(token.line, f" at '{token.lexeme}'", message)
         return ParseError()
+
+
+# The method that parses each kind of statement, by the token that starts it
+# (see Parser.statement())
+_STATEMENT_PARSERS: Dict[TokenType, Callable[[Parser], Stmt]] = {
+    TokenType.FOR: Parser.for_statement,
+    TokenType.IF: Parser.if_statement,
+    TokenType.PRINT: Parser.print_statement,
+    TokenType.RETURN: Parser.return_statement,
+    TokenType.WHILE: Parser.while_statement,
+    TokenType.LEFT_BRACE: Parser.block_statement,
+}
@@ -0,0 +1,206 @@
+from typing import Dict, List
+
+from lox.expr import (
+    Assign,
+    Binary,
+    Call,
+    ExprVisitor,
+    Grouping,
+    Literal,
+    Logical,
+    LogicalChain,
+    Unary,
+    Variable,
+)
+from lox.stmt import (
+    Block,
+    Expression,
+    Function,
+    If,
+    Print,
+    Return,
+    Stmt,
+    StmtVisitor,
+    Var,
+    While,
+)
+from lox.token import Token
+
+
+class Resolver(ExprVisitor[None], StmtVisitor[None]):
+    """
+    Statically resolves every local variable to a (depth, slot) pair, so that
+    at runtime a variable access is a walk up `depth` environments followed by
+    a list index instead of a dict lookup in every scope along the way.
+
+    depth counts scopes between the use and the declaration (0 = the innermost
+    scope). Variables that aren't found in any local scope are assumed to be
+    global and keep depth None; globals stay in a dict so the REPL can keep
+    adding to them.
+
+    The annotations are written directly onto the syntax tree:
+        Variable/Assign: depth, slot
+        Var/Function:    slot (None at the top level)
+        Block/Function:  slot_count, the size of the scope they create
+        Function:        has_closures, is_pure
+
+    A function is pure if its body doesn't print, declare other functions,
+    call anything but itself, or touch any variable outside its own scopes
+    except its own name. Anything else might observe or cause side effects.
+    """
+
+    def __init__(self):
+        # Each scope maps a variable name to its slot index in that scope
+        self.scopes: List[Dict[str, int]] = []
+        # The functions whose bodies are being resolved, innermost last, and
+        # the index in scopes of each one's own scope
+        self.functions: List[Function] = []
+        self.function_scopes: List[int] = []
+
+    def resolve(self, statements: List[Stmt]) -> None:
+        for statement in statements:
+            statement.accept(self)
+
+    def visit_block_stmt(self, stmt: Block) -> None:
+        self.scopes.append({})
+        self.resolve(stmt.statements)
+        stmt.slot_count = len(self.scopes.pop())
+
+    def visit_var_stmt(self, stmt: Var) -> None:
+        # Resolve the initializer before declaring the name, so that
+        #   var a = 1; { var a = a + 2; }
+        # reads the outer a, like it did before variables were resolved.
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        stmt.slot = self._declare(stmt.name)
+
+    def visit_function_stmt(self, stmt: Function) -> None:
+        # Declare the name first so the function can refer to itself
+        stmt.slot = self._declare(stmt.name)
+        # Any function this one is nested in might have its scope captured
+        for function in self.functions:
+            function.has_closures = True
+        self._mark_impure(-1)
+
+        # Parameters and the body's own variables share a single scope
+        self.scopes.append({})
+        for param in stmt.params:
+            self._declare(param)
+        stmt.is_pure = True
+        self.functions.append(stmt)
+        self.function_scopes.append(len(self.scopes) - 1)
+        self.resolve(stmt.body)
+        self.function_scopes.pop()
+        self.functions.pop()
+        stmt.slot_count = len(self.scopes.pop())
+
+    def visit_expression_stmt(self, stmt: Expression) -> None:
+        stmt.expression.accept(self)
+
+    def visit_if_stmt(self, stmt: If) -> None:
+        stmt.condition.accept(self)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_print_stmt(self, stmt: Print) -> None:
+        stmt.expression.accept(self)
+        self._mark_impure(-1)
+
+    def visit_return_stmt(self, stmt: Return) -> None:
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    def visit_while_stmt(self, stmt: While) -> None:
+        stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    def visit_variable_expr(self, expr: Variable) -> None:
+        expr.depth, expr.slot = self._resolve_local(expr.name)
+        # A function's own name is declared in a scope of any function around
+        # it, so reading it only makes the function itself impure, and that
+        # is allowed
+        if not self._is_own_name(expr):
+            self._mark_impure(self._scope_index(expr.depth))
+
+    def visit_assign_expr(self, expr: Assign) -> None:
+        expr.value.accept(self)
+        expr.depth, expr.slot = self._resolve_local(expr.name)
+        self._mark_impure(self._scope_index(expr.depth))
+
+    def visit_binary(self, expr: Binary) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_call(self, expr: Call) -> None:
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+        # A pure function may only call itself: anything else might be clock()
+        # or a function with side effects
+        if not (isinstance(expr.callee, Variable) and self._is_own_name(expr.callee)):
+            self._mark_impure(-1)
+
+    def visit_grouping(self, expr: Grouping) -> None:
+        expr.expression.accept(self)
+
+    def visit_literal(self, expr: Literal) -> None:
+        pass
+
+    def visit_logical(self, expr: Logical) -> None:
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_logical_chain(self, expr: LogicalChain) -> None:
+        for operand in expr.operands:
+            operand.accept(self)
+
+    def visit_unary(self, expr: Unary) -> None:
+        expr.right.accept(self)
+
+    def _declare(self, name: Token) -> int | None:
+        """Give name a slot in the innermost scope (None for globals)."""
+        if not self.scopes:
+            return None
+
+        scope = self.scopes[-1]
+        # Redeclaring a variable in the same scope reuses its slot, matching
+        # define()'s overwrite semantics
+        if name.lexeme not in scope:
+            scope[name.lexeme] = len(scope)
+        return scope[name.lexeme]
+
+    def _scope_index(self, depth: int | None) -> int:
+        """The index in scopes of a resolved variable's scope (-1 for globals)."""
+        if depth is None:
+            return -1
+        return len(self.scopes) - 1 - depth
+
+    def _is_own_name(self, expr: Variable) -> bool:
+        """Whether expr reads the innermost function's own name."""
+        if not self.functions:
+            return False
+        function = self.functions[-1]
+        return (
+            expr.name.lexeme == function.name.lexeme
+            and self._scope_index(expr.depth) == self.function_scopes[-1] - 1
+            and expr.slot == function.slot
+        )
+
+    def _mark_impure(self, scope_index: int) -> None:
+        """
+        Mark every function being resolved whose scopes don't include the one
+        at scope_index as impure; -1 marks all of them.
+        """
+        functions = zip(self.functions, self.function_scopes, strict=True)
+        for function, function_scope in functions:
+            if scope_index < function_scope:
+                function.is_pure = False
+
+    def _resolve_local(self, name: Token) -> tuple[int | None, int | None]:
+        for depth, scope in enumerate(reversed(self.scopes)):
+            if name.lexeme in scope:
+                return depth, scope[name.lexeme]
+
+        # Not found locally: assume it's global
+        return None, None
@@ -1,8 +1,68 @@
-from typing import Any, Dict, List
+import re
+import sys
+from typing import Dict, List
 
 from lox.token import Token
 from lox.token_type import TokenType
 
+# The whole lexical grammar as one regex, matched once per lexeme. The regex
+# engine runs each match in C, so the scanner's Python code runs once per token
+# rather than once per character. scan_tokens() tells the alternatives apart by
+# their group numbers.
+_LEXEME_PATTERN = re.compile(
+    r"""
+    ([ \t\r]+|//[^\n]*)         # 1: whitespace and comments
+    |(\n)                       # 2: newlines
+    |([^\W\d]\w*)               # 3: identifiers and keywords
+    |([0-9]+(?:\.[0-9]+)?)      # 4: numbers
+    |("[^"]*"?)                 # 5: strings, possibly unterminated
+    |([!=<>]=?|[-+*/(){},.;])   # 6: punctuation
+    """,
+    re.VERBOSE,
+)
+_SKIPPED = 1
+_NEWLINE = 2
+_WORD = 3
+_NUMBER_LITERAL = 4
+_STRING_LITERAL = 5
+# Notes on the alternatives:
+# - Digits are only ASCII ones, since (sub/super)scripted numbers pass isdigit().
+#   A fractional part is only taken if a digit follows the '.'.
+# - For str patterns, \w matches exactly the characters that pass isalnum(),
+#   plus the underscore. [^\W\d] leaves out decimal digits, but still lets
+#   through a few numeric characters that can't start an identifier (e.g. '²'),
+#   which scan_tokens() rejects.
+# - Only ' ', '\r' and '\t' are whitespace. Any character no alternative
+#   matches is unexpected.
+
+# Token types of punctuation, by lexeme
+_PUNCTUATION: Dict[str, TokenType] = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+# Looked up once here rather than on TokenType for every identifier, number and
+# string scanned (see the token types at the top of parser.py)
+_IDENTIFIER = TokenType.IDENTIFIER
+_NUMBER = TokenType.NUMBER
+_STRING = TokenType.STRING
+
 
 class Scanner:
     keywords: Dict[str, TokenType] = {
@@ -30,161 +90,70 @@ class Scanner:
     def __init__(self, source: str) -> None:
         self.source = source
         self.tokens: List[Token] = []
-        self.start = 0
-        self.current = 0
         self.line = 1
 
     def scan_tokens(self) -> List[Token]:
-        while not self._is_at_end():
-            # We are at the beginning of the next lexeme
-            self.start = self.current
-            self._scan_token()
-
-        self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        source = self.source
+        end = len(source)
+        match = _LEXEME_PATTERN.match
+        keywords = self.keywords
+        append = self.tokens.append
+        line = self.line
+
+        current = 0
+        while current < end:
+            m = match(source, current)
+            if m is None:
+                self._error(line, "Unexpected character.")
+                current += 1
+                continue
+
+            current = m.end()
+            kind = m.lastindex
+            if kind == _SKIPPED:
+                continue
+            if kind == _NEWLINE:
+                line += 1
+                continue
+
+            text = m.group()
+            if kind == _WORD:
+                if not (text[0].isalpha() or text[0] == "_"):
+                    # Only the first character is unexpected: scanning
+                    # resumes right after it
+                    self._error(line, "Unexpected character.")
+                    current = m.start() + 1
+                    continue
+
+                # The identifier's text is interned so that every use of the
+                # same name shares one string object, which makes the dict
+                # lookups for global variables compare pointers instead of
+                # characters.
+                text = sys.intern(text)
+
+                # Look up the token type, defaulting to IDENTIFIER if not a
+                # keyword
+                token_type = keywords.get(text, _IDENTIFIER)
+                append(Token(token_type, text, None, line))
+            elif kind == _NUMBER_LITERAL:
+                append(Token(_NUMBER, text, float(text), line))
+            elif kind == _STRING_LITERAL:
+                # Strings can span lines
+                line += text.count("\n")
+                if len(text) == 1 or text[-1] != '"':
+                    self._error(line, "Unterminated string.")
+                    continue
+
+                # Trim the surrounding quotes
+                append(Token(_STRING, text, text[1:-1], line))
+            else:
+                append(Token(_PUNCTUATION[text], text, None, line))
+
+        self.line = line
+        append(Token(TokenType.EOF, "", None, line))
         return self.tokens
 
-    def _scan_token(self) -> None:
-        c = self._advance()
-        match c:
-            case "(":
-                self._add_token(TokenType.LEFT_PAREN)
-            case ")":
-                self._add_token(TokenType.RIGHT_PAREN)
-            case "{":
-                self._add_token(TokenType.LEFT_BRACE)
-            case "}":
-                self._add_token(TokenType.RIGHT_BRACE)
-            case ",":
-                self._add_token(TokenType.COMMA)
-            case ".":
-                self._add_token(TokenType.DOT)
-            case "-":
-                self._add_token(TokenType.MINUS)
-            case "+":
-                self._add_token(TokenType.PLUS)
-            case ";":
-                self._add_token(TokenType.SEMICOLON)
-            case "*":
-                self._add_token(TokenType.STAR)
-            case "!":
-                token_type = (
-                    TokenType.BANG_EQUAL if self._match("=") else TokenType.BANG
-                )
-                self._add_token(token_type)
-            case "=":
-                token_type = (
-                    TokenType.EQUAL_EQUAL if self._match("=") else TokenType.EQUAL
-                )
-                self._add_token(token_type)
-            case "<":
-                token_type = (
-                    TokenType.LESS_EQUAL if self._match("=") else TokenType.LESS
-                )
-                self._add_token(token_type)
-            case ">":
-                token_type = (
-                    TokenType.GREATER_EQUAL if self._match("=") else TokenType.GREATER
-                )
-                self._add_token(token_type)
-            case "/":
-                if self._match("/"):
-                    # A comment goes until the end of the line
-                    while self._peek() != "\n" and not self._is_at_end():
-                        self._advance()
-                else:
-                    self._add_token(TokenType.SLASH)
-            case " " | "\r" | "\t":
-                pass
-            case "\n":
-                self.line += 1
-            case '"':
-                self._string()
-            case _:
-                # isdigit() does not work since (sub/super)scripted numbers fly
-                # through it.
-                if "0" <= c <= "9":
-                    self._number()
-                elif c.isalpha() or c == "_":
-                    self._identifier()
-                else:
-                    from lox.lox import Lox
-
-                    Lox.error(self.line, "Unexpected character.")
-
-    def _string(self) -> None:
-        while self._peek() != '"' and not self._is_at_end():
-            if self._peek() == "\n":
-                self.line += 1
-            self._advance()
-
-        if self._is_at_end():
-            from lox.lox import Lox
-
-            Lox.error(self.line, "Unterminated string.")
-            return
-
-        # The closing "
-        self._advance()
-
-        # Trim the surrounding quotes
-        value = self.source[self.start + 1 : self.current - 1]
-        self._add_token(TokenType.STRING, value)
-
-    def _number(self) -> None:
-        while "0" <= self._peek() <= "9":
-            self._advance()
-
-        # Look for a fractional part
-        if self._peek() == "." and "0" <= self._peek_next() <= "9":
-            # Consume the '.'
-            self._advance()
-
-            while "0" <= self._peek() <= "9":
-                self._advance()
-
-        value = float(self.source[self.start : self.current])
-        self._add_token(TokenType.NUMBER, value)
-
-    def _identifier(self) -> None:
-        # Maximal munch
-        while self._peek().isalnum() or self._peek() == "_":
-            self._advance()
-
-        # Get the text of the identifier
-        text = self.source[self.start : self.current]
-
-        # Look up the token type, defaulting to IDENTIFIER if not a keyword
-        token_type = self.keywords.get(text, TokenType.IDENTIFIER)
-        self._add_token(token_type)
-
-    def _peek(self) -> str:
-        if self._is_at_end():
-            # Use '' as the sentinel value instead of the Java '\0' in the
-            # book, since Python strings aren't null terminated
-            return ""
-        return self.source[self.current]
-
-    def _peek_next(self) -> str:
-        if self.current + 1 >= len(self.source):
-            return ""
-        return self.source[self.current + 1]
-
-    def _is_at_end(self) -> bool:
-        return self.current >= len(self.source)
-
-    def _advance(self) -> str:
-        self.current += 1
-        return self.source[self.current - 1]
-
-    def _match(self, expected: str) -> bool:
-        if self._is_at_end():
-            return False
-        if self.source[self.current] != expected:
-            return False
-
-        self.current += 1
-        return True
-
-    def _add_token(self, type: TokenType, literal: Any = None) -> None:
-        text = self.source[self.start : self.current]
-        self.tokens.append(Token(type, text, literal, self.line))
+    def _error(self, line: int, message: str) -> None:
+        from lox.lox import Lox
+
+        Lox.error(line, message)
@@ -8,12 +8,19 @@ R = TypeVar("R")
 
 
 class Stmt(ABC):
+    # Every node class declares __slots__, so nodes don't each carry a __dict__.
+    # Programs can have thousands of nodes, and __slots__ attributes are also
+    # faster to read than dict entries.
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: "StmtVisitor[R]") -> R:
         pass
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -22,6 +29,8 @@ class Expression(Stmt):
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -30,7 +39,11 @@ class Print(Stmt):
 
 
 class If(Stmt):
-    def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Stmt):
+    __slots__ = ("condition", "else_branch", "then_branch")
+
+    def __init__(
+        self, condition: Expr, then_branch: Stmt, else_branch: Stmt | None = None
+    ):
         self.condition = condition
         self.else_branch = else_branch
         self.then_branch = then_branch
@@ -40,6 +53,8 @@ class If(Stmt):
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition: Expr, body: Stmt):
         self.condition = condition
         self.body = body
@@ -49,23 +64,33 @@ class While(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer", "slot")
+
     def __init__(self, name: Token, initializer: Expr | None):
         self.name = name
         self.initializer = initializer
+        # Filled in by the Resolver; None for global variables
+        self.slot: int | None = None
 
     def accept(self, visitor: "StmtVisitor[R]") -> R:
         return visitor.visit_var_stmt(self)
 
 
 class Block(Stmt):
+    __slots__ = ("statements", "slot_count")
+
     def __init__(self, statements: List[Stmt]):
         self.statements = statements
+        # Filled in by the Resolver: how many variables the block declares
+        self.slot_count = 0
 
     def accept(self, visitor: "StmtVisitor[R]") -> R:
         return visitor.visit_block_stmt(self)
 
 
 class Return(Stmt):
+    __slots__ = ("keyword", "value")
+
     def __init__(self, keyword: Token, value: Expr | None):
         self.keyword = keyword
         self.value = value
@@ -75,10 +100,31 @@ class Return(Stmt):
 
 
 class Function(Stmt):
+    __slots__ = (
+        "name",
+        "params",
+        "body",
+        "slot",
+        "slot_count",
+        "has_closures",
+        "is_pure",
+    )
+
     def __init__(self, name: Token, params: List[Token], body: List[Stmt]):
         self.name = name
         self.params = params
         self.body = body
+        # Filled in by the Resolver: the slot holding the function itself
+        # (None for global functions) and how many slots a call needs for
+        # its parameters and local variables
+        self.slot: int | None = None
+        self.slot_count = len(params)
+        # Also filled in by the Resolver: whether another function is declared
+        # anywhere inside this one, and so might capture a call's scope
+        self.has_closures = False
+        # And whether calls depend only on their arguments and have no side
+        # effects, so their results can be cached
+        self.is_pure = False
 
     def accept(self, visitor: "StmtVisitor[R]") -> R:
         return visitor.visit_function_stmt(self)
@@ -1,4 +1,4 @@
-from enum import Enum, auto, unique
+from enum import Enum, IntEnum, auto, unique
 
 
 # The @unique decorator catches enum members which have the same value during
@@ -8,8 +8,18 @@ from enum import Enum, auto, unique
 # default? Because some use cases legitimately want duplicate values (like
 # aliases). Making it opt-in follows the PEP20 principle of "Explicit is better
 # than implicit." See https://peps.python.org/pep-0020/.
+#
+# TokenType is an IntEnum rather than a plain Enum for speed: the scanner and
+# parser test token types constantly, including as dict keys and set members,
+# and an IntEnum member hashes and compares with int's C methods instead of
+# Enum's Python-level __hash__.
 @unique
-class TokenType(Enum):
+class TokenType(IntEnum):
+    # Print and format as TokenType.PLUS etc., like a plain Enum, rather than
+    # as the bare integer value
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
+
     # Single-character tokens
     # Use auto() for automatic value assignment, see
     # https://docs.python.org/3/library/enum.html#enum.auto.
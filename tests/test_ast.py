@@ -1,4 +1,5 @@
-from typing import Any, List
+import gc
+from typing import Any, Iterator, List
 
 import pytest
 from hypothesis import given
@@ -11,84 +12,84 @@ from lox.token import Token
 from lox.token_type import TokenType
 
 
-# Custom strategies for generating test data
-@st.composite
-def tokens(draw) -> Token:
+@pytest.fixture
+def without_cyclic_gc() -> Iterator[None]:
+    """Pause the cyclic GC, which Hypothesis' allocations keep triggering."""
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+        gc.collect()
+
+
+_LEXEMES = {
+    TokenType.MINUS: "-",
+    TokenType.PLUS: "+",
+    TokenType.SLASH: "/",
+    TokenType.STAR: "*",
+    TokenType.BANG: "!",
+    TokenType.EQUAL_EQUAL: "==",
+    TokenType.GREATER: ">",
+    TokenType.LESS: "<",
+}
+
+# Custom strategies for generating test data. The operator token strategy is
+# built once, since the state machine below draws operators on most steps.
+_tokens = st.builds(
+    lambda type_, line: Token(type_, _LEXEMES[type_], None, line),
+    st.sampled_from(tuple(_LEXEMES)),
+    st.integers(min_value=1, max_value=1000),
+)
+
+
+def tokens() -> st.SearchStrategy[Token]:
     """Generate valid tokens for our expressions."""
-    token_types = [
-        TokenType.MINUS,
-        TokenType.PLUS,
-        TokenType.SLASH,
-        TokenType.STAR,
-        TokenType.BANG,
-        TokenType.EQUAL_EQUAL,
-        TokenType.GREATER,
-        TokenType.LESS,
-    ]
-
-    type_ = draw(st.sampled_from(token_types))
-    lexeme = {
-        TokenType.MINUS: "-",
-        TokenType.PLUS: "+",
-        TokenType.SLASH: "/",
-        TokenType.STAR: "*",
-        TokenType.BANG: "!",
-        TokenType.EQUAL_EQUAL: "==",
-        TokenType.GREATER: ">",
-        TokenType.LESS: "<",
-    }[type_]
-
-    line = draw(st.integers(min_value=1, max_value=1000))
-    return Token(type_, lexeme, None, line)
-
-
-@st.composite
-def literals(draw) -> Any:
+    return _tokens
+
+
+_literals = st.one_of(
+    st.none(),
+    st.booleans(),
+    st.floats(allow_nan=False, allow_infinity=False),
+    # min_size=1 ensures no empty strings.
+    # Blacklisting parens ensures the LPAREN == RPAREN in the structural
+    # check below doesn't mess up.
+    st.text(
+        min_size=1,
+        alphabet=st.characters(
+            blacklist_characters={"(", ")"}, blacklist_categories=("Cs",)
+        ),
+    ),
+)
+
+
+def literals() -> st.SearchStrategy[Any]:
     """Generate valid literal values."""
-    return draw(
-        st.one_of(
-            st.none(),
-            st.booleans(),
-            st.floats(allow_nan=False, allow_infinity=False),
-            # min_size=1 ensures no empty strings.
-            # Blacklisting parens ensures the LPAREN == RPAREN in the structural
-            # check below doesn't mess up.
-            st.text(
-                min_size=1,
-                alphabet=st.characters(
-                    blacklist_characters={"(", ")"}, blacklist_categories=("Cs",)
-                ),
-            ),
-        )
-    )
+    return _literals
+
+
+# Hypothesis' own recursive strategy bounds the trees by their number of
+# leaves. A composite that drew from a new expressions() strategy at every
+# level spent most of the stateful test's time constructing and validating
+# those strategies.
+_expressions = st.recursive(
+    st.builds(Literal, _literals),
+    lambda operands: st.one_of(
+        st.builds(Binary, operands, _tokens, operands),
+        st.builds(Grouping, operands),
+        st.builds(Unary, _tokens, operands),
+    ),
+    max_leaves=4,
+)
 
 
-@st.composite
-def expressions(draw, max_depth=3) -> "Expr":
+def expressions() -> st.SearchStrategy[Expr]:
     """Recursively generate valid expression trees."""
-    if max_depth <= 1:
-        # Base case: generate a literal
-        return Literal(draw(literals()))
-
-    # Recursive case: generate more complex expressions
-    expr_type = draw(st.sampled_from(["binary", "grouping", "unary", "literal"]))
-
-    if expr_type == "binary":
-        left = draw(expressions(max_depth=max_depth - 1))
-        right = draw(expressions(max_depth=max_depth - 1))
-        operator = draw(tokens())
-        return Binary(left, operator, right)
-    elif expr_type == "grouping":
-        expr = draw(expressions(max_depth=max_depth - 1))
-        return Grouping(expr)
-    elif expr_type == "unary":
-        operator = draw(tokens())
-        right = draw(expressions(max_depth=max_depth - 1))
-        return Unary(operator, right)
-    else:
-        return Literal(draw(literals()))
+    return _expressions
 
 
+@pytest.mark.usefixtures("without_cyclic_gc")
 class TestAstPrinter:
     @given(expressions())
     def test_printer_output_format(self, expr):
@@ -174,7 +175,9 @@ class ExpressionStateMachine(RuleBasedStateMachine):
 
 
 # Convert state machine into a runnable test
-TestExpressions = ExpressionStateMachine.TestCase
+TestExpressions = pytest.mark.usefixtures("without_cyclic_gc")(
+    ExpressionStateMachine.TestCase
+)
 
 
 def test_specific_cases():
@@ -198,3 +201,18 @@ def test_specific_cases():
     expr = Literal(None)
     result = printer.print(expr)
     assert result == "nil"
+
+
+def test_accept_returns_the_printed_text():
+    expr = Unary(Token(TokenType.MINUS, "-", None, 1), Grouping(Literal(42)))
+    printer = AstPrinter()
+    assert expr.accept(printer) == "(- (group 42))"
+    assert printer.visit_literal(Literal(None)) == "nil"
+
+
+def test_nodes_have_no_instance_dict():
+    """Nodes use __slots__, so they can't grow a per-instance __dict__."""
+    expr = Binary(Literal(1.0), Token(TokenType.PLUS, "+", None, 1), Literal(2.0))
+    assert not hasattr(expr, "__dict__")
+    with pytest.raises(AttributeError):
+        expr.unknown = 1  # type: ignore[attr-defined]
@@ -0,0 +1,233 @@
+from typing import List
+
+import pytest
+
+from lox.compiler import (
+    ADD,
+    ADD_NUM,
+    JUMP,
+    JUMP_IF_NOT_LESS,
+    LOAD_CONST,
+    LOAD_ENCLOSING,
+    LOAD_GLOBAL,
+    LOAD_LOCAL,
+    MAKE_FUNCTION,
+    POP,
+    POP_JUMP_IF_FALSE,
+    PRINT,
+    RETURN,
+    CodeObject,
+    Compiler,
+)
+from lox.interpreter import Interpreter
+from lox.parser import Parser
+from lox.resolver import Resolver
+from lox.scanner import Scanner
+from lox.stmt import Stmt
+
+
+def parse(source: str) -> List[Stmt]:
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def compile_source(source: str) -> CodeObject:
+    return Compiler().compile(parse(source))
+
+
+def run(source: str, capfd: pytest.CaptureFixture[str]) -> str:
+    """Run a program through the bytecode interpreter and return its stdout."""
+    Interpreter().interpret(parse(source))
+    return capfd.readouterr().out
+
+
+def test_compiles_to_flat_instructions():
+    code = compile_source("print 1 + 2;")
+    assert [op for op, _ in code.ops] == [
+        LOAD_CONST,
+        LOAD_CONST,
+        ADD_NUM,
+        PRINT,
+        LOAD_CONST,
+        RETURN,
+    ]
+    assert code.consts == [1.0, 2.0, None]
+
+
+@pytest.mark.parametrize(
+    "source,opcode",
+    [
+        ("-a + (b * c);", ADD_NUM),
+        ("a + 1;", ADD),
+        ('"a" + 1;', ADD),
+        ("(a + b) + 1;", ADD),
+    ],
+)
+def test_numeric_opcodes_need_known_number_operands(source: str, opcode: int) -> None:
+    code = compile_source(source)
+    assert code.ops[-4][0] == opcode
+
+
+def test_variable_loads_depend_on_resolved_scope():
+    statements = parse("var g; { var a; { var b; print g; print a; print b; } }")
+    Resolver().resolve(statements)
+    loads = [
+        (op, arg)
+        for op, arg in Compiler().compile(statements).ops
+        if op in (LOAD_GLOBAL, LOAD_ENCLOSING, LOAD_LOCAL)
+    ]
+    assert [op for op, _ in loads] == [LOAD_GLOBAL, LOAD_ENCLOSING, LOAD_LOCAL]
+    assert loads[1][1] == (1, 0)
+    assert loads[2][1] == 0
+
+
+def test_expression_statement_pops_its_value():
+    code = compile_source("1;")
+    assert [op for op, _ in code.ops][:2] == [LOAD_CONST, POP]
+
+
+def test_while_jumps_back_to_condition():
+    code = compile_source("while (a) print 1;")
+    ops = code.ops
+    exit_jump = next(i for i, (op, _) in enumerate(ops) if op == POP_JUMP_IF_FALSE)
+    loop_jump = next(i for i, (op, _) in enumerate(ops) if op == JUMP)
+    # The loop jumps back to the condition, and the exit lands just past the loop
+    assert ops[loop_jump][1] == 0
+    assert ops[exit_jump][1] == loop_jump + 1
+
+
+def test_comparison_conditions_fuse_with_their_jump():
+    code = compile_source("var i = 0; while (i < 3) i = i + 1;")
+    ops = code.ops
+    exit_jump = next(i for i, (op, _) in enumerate(ops) if op == JUMP_IF_NOT_LESS)
+    loop_jump = next(i for i, (op, _) in enumerate(ops) if op == JUMP)
+    target, operator = ops[exit_jump][1]
+    assert target == loop_jump + 1
+    assert operator.lexeme == "<"
+    assert POP_JUMP_IF_FALSE not in [op for op, _ in ops]
+
+
+def test_constant_conditions_compile_only_the_code_that_runs():
+    code = compile_source('if (true) print "a"; else print "b"; while (nil) print "c";')
+    assert [op for op, _ in code.ops] == [LOAD_CONST, PRINT, LOAD_CONST, RETURN]
+    assert code.consts[0] == "a"
+
+    # A loop whose condition is always true doesn't test it
+    code = compile_source("for (;;) print 1;")
+    assert [op for op, _ in code.ops[:3]] == [LOAD_CONST, PRINT, JUMP]
+    assert code.ops[2][1] == 0
+
+
+def test_function_body_is_compiled_once():
+    code = compile_source("fun f(a) { return a; }")
+    op, index = code.ops[0]
+    assert op == MAKE_FUNCTION
+    declaration, body = code.consts[index]
+    assert declaration.name.lexeme == "f"
+    assert isinstance(body, CodeObject)
+    assert body.name == "f"
+    assert [op for op, _ in body.ops][-1] == RETURN
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("print 2 + 3 * 4;", "14\n"),
+        ('print "a" + "b";', "ab\n"),
+        ("print -(1 - 3) / 4;", "0.5\n"),
+        ("var a = 3; print -a * (a - 1) < -a;", "true\n"),
+        ("print !nil == true;", "true\n"),
+        ("print 1 != 1;", "false\n"),
+        ("var a; print a == nil;", "true\n"),
+        ("var a; print a == 0;", "false\n"),
+        ('var a = ""; print nil != a;', "true\n"),
+        ("fun f() {} fun g() {} print f == f; print f == g;", "true\nfalse\n"),
+        ("print 1 <= 2 and 3 >= 4;", "false\n"),
+        ('print nil or "default";', "default\n"),
+        ('print "first" and "second";', "second\n"),
+        ("var a; print a or false or 3 or a;", "3\n"),
+        ("var a = 1; print a and 2 and nil and a;", "nil\n"),
+        ("var a = 1; print a and 2 and a;", "1\n"),
+        ("var a; print a;", "nil\n"),
+        ("var a = 1; a = a + 1; print a;", "2\n"),
+        ("var i = 0; while (i < 3) { print i; i = i + 1; }", "0\n1\n2\n"),
+        ("for (var i = 0; i < 2; i = i + 1) print i;", "0\n1\n"),
+        ("if (false) print 1; else print 2;", "2\n"),
+        ("if (0) print 1;", "1\n"),
+        ("if (2 >= 2) print 1; else print 2;", "1\n"),
+        ("var a = 2; if (a > 2) print 1; else print 2;", "2\n"),
+        ("var a = 3; if (a <= 2) print 1;", ""),
+        ('var a = "outer"; { var a = "inner"; print a; } print a;', "inner\nouter\n"),
+    ],
+)
+def test_runs_programs(
+    source: str, expected: str, capfd: pytest.CaptureFixture[str]
+) -> None:
+    assert run(source, capfd) == expected
+
+
+def test_functions_and_recursion(capfd: pytest.CaptureFixture[str]) -> None:
+    source = """
+    fun fib(n) {
+      if (n <= 1) return n;
+      return fib(n - 2) + fib(n - 1);
+    }
+    print fib(10);
+    fun noReturn() {}
+    print noReturn();
+    print fib;
+    """
+    assert run(source, capfd) == "55\nnil\n<fn fib>\n"
+
+
+def test_closures_capture_their_environment(capfd: pytest.CaptureFixture[str]) -> None:
+    source = """
+    fun makeCounter() {
+      var i = 0;
+      fun count() {
+        i = i + 1;
+        return i;
+      }
+      return count;
+    }
+    var a = makeCounter();
+    var b = makeCounter();
+    print a();
+    print a();
+    print b();
+    """
+    assert run(source, capfd) == "1\n2\n1\n"
+
+
+def test_return_from_inside_loop_and_block(capfd: pytest.CaptureFixture[str]) -> None:
+    source = """
+    fun find() {
+      var i = 0;
+      while (true) {
+        { if (i == 3) return i; }
+        i = i + 1;
+      }
+    }
+    print find();
+    """
+    assert run(source, capfd) == "3\n"
+
+
+@pytest.mark.parametrize(
+    "source,message",
+    [
+        ('print 1 + "a";', "Operands must be two numbers or two strings."),
+        ('print 1 < "a";', "Operands must be numbers."),
+        ('print -"a";', "Operand must be a number."),
+        ("print undefined;", "Undefined variable 'undefined'."),
+        ('while ("a" < 1) print 1;', "Operands must be numbers."),
+        ('"not a function"();', "Can only call functions and classes."),
+        ("fun f(a) {} f();", "Expected 1 arguments but got 0."),
+    ],
+)
+def test_runtime_errors_are_reported(
+    source: str, message: str, capfd: pytest.CaptureFixture[str]
+) -> None:
+    Interpreter().interpret(parse(source))
+    captured = capfd.readouterr()
+    assert message in captured.err
+    assert "[line 1]" in captured.err
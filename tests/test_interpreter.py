@@ -4,7 +4,10 @@ import pytest
 
 from lox.expr import Binary, Grouping, Literal, Unary
 from lox.interpreter import Interpreter, RuntimeError
-from lox.stmt import Expression
+from lox.parser import Parser
+from lox.resolver import Resolver
+from lox.scanner import Scanner
+from lox.stmt import Expression, If, Print, While
 from lox.token import Token
 from lox.token_type import TokenType
 
@@ -71,6 +74,26 @@ def test_grouping_expression(interpreter: Interpreter) -> None:
     assert interpreter._stringify(result) == "42"
 
 
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (0.0, "0"),
+        (-0.0, "-0"),
+        (7.0, "7"),
+        (-12.0, "-12"),
+        (2.5, "2.5"),
+        (1e15, "1000000000000000"),
+        (1e16, "1e+16"),
+        (1e20, "1e+20"),
+        (float("inf"), "inf"),
+    ],
+)
+def test_stringify_numbers(
+    interpreter: Interpreter, value: float, expected: str
+) -> None:
+    assert interpreter._stringify(value) == expected
+
+
 @pytest.mark.parametrize(
     "operator_type,operand,expected",
     [
@@ -218,3 +241,58 @@ def test_truthy_values(interpreter: Interpreter) -> None:
     # Implementation detail, but important for extensibility: even non-Lox types
     # should be truthy
     assert interpreter._is_truthy([])
+
+
+@pytest.mark.parametrize(
+    "condition,expected",
+    [(None, "else"), (False, "else"), (0.0, "then"), ("", "then"), (True, "then")],
+)
+def test_if_statement_truthiness(
+    interpreter: Interpreter,
+    condition: Any,
+    expected: str,
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    """The inlined truthiness test in visit_if_stmt follows _is_truthy()."""
+    stmt = If(Literal(condition), Print(Literal("then")), Print(Literal("else")))
+    interpreter._execute(stmt)
+    assert capfd.readouterr().out == f"{expected}\n"
+
+
+def test_while_statement_stops_on_falsey_condition(interpreter: Interpreter) -> None:
+    interpreter._execute(While(Literal(None), Print(Literal("unreachable"))))
+    interpreter._execute(While(Literal(False), Print(Literal("unreachable"))))
+
+
+def test_tree_walker_runs_resolved_programs(
+    interpreter: Interpreter, capfd: pytest.CaptureFixture[str]
+) -> None:
+    """_execute() dispatches every statement and expression type."""
+    source = """
+    fun fib(n) {
+      if (n <= 1) return n;
+      return fib(n - 2) + fib(n - 1);
+    }
+    var total = 0;
+    for (var i = 0; i < 5; i = i + 1) {
+      total = total + fib(i);
+    }
+    print total;
+    print -(1) == -1 and !nil;
+    print total < 0 or nil or "last";
+    """
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver().resolve(statements)
+    for statement in statements:
+        interpreter._execute(statement)
+    assert capfd.readouterr().out == "7\ntrue\nlast\n"
+
+
+@pytest.mark.parametrize("source", ["print missing;", "missing = 1;"])
+def test_tree_walker_reports_undefined_globals(
+    interpreter: Interpreter, source: str
+) -> None:
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver().resolve(statements)
+    with pytest.raises(RuntimeError, match="Undefined variable 'missing'."):
+        interpreter._execute(statements[0])
@@ -0,0 +1,114 @@
+from typing import Any, List
+
+import pytest
+
+from lox.expr import Binary, Literal, Logical, LogicalChain, Unary, Variable
+from lox.interpreter import Interpreter
+from lox.optimizer import ConstantFolder
+from lox.parser import Parser
+from lox.scanner import Scanner
+from lox.stmt import Print, Stmt
+
+
+def fold(source: str) -> List[Stmt]:
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    ConstantFolder().fold(statements)
+    return statements
+
+
+def folded_expression(source: str) -> Any:
+    (statement,) = fold(f"print {source};")
+    assert isinstance(statement, Print)
+    return statement.expression
+
+
+@pytest.mark.parametrize(
+    "source,value",
+    [
+        ("1 + 2 * 3", 7.0),
+        ("(1 + 2) * 3", 9.0),
+        ("-(4 / 2)", -2.0),
+        ('"a" + "b"', "ab"),
+        ("!nil", True),
+        ("1 < 2", True),
+        ("nil == nil", True),
+        ('1 != "1"', True),
+        ("-0", -0.0),
+    ],
+)
+def test_folds_constant_expressions(source: str, value: Any) -> None:
+    expr = folded_expression(source)
+    assert isinstance(expr, Literal)
+    assert expr.value == value
+    assert type(expr.value) is type(value)
+
+
+@pytest.mark.parametrize("source", ['-"a"', '1 + "a"', "nil < 1", "1 / 0"])
+def test_leaves_erroring_expressions_for_runtime(source: str) -> None:
+    assert isinstance(folded_expression(source), (Unary, Binary))
+
+
+@pytest.mark.parametrize(
+    "source,kept",
+    [
+        ("true or a", "left"),
+        ("nil or a", "right"),
+        ("0 and a", "right"),
+        ("false and a", "left"),
+    ],
+)
+def test_short_circuits_constant_logical_operands(source: str, kept: str) -> None:
+    expr = folded_expression(source)
+    if kept == "left":
+        assert isinstance(expr, Literal)
+    else:
+        assert isinstance(expr, Variable)
+        assert expr.name.lexeme == "a"
+
+
+@pytest.mark.parametrize(
+    "source,folded",
+    [
+        ("a or false or b or c", "(a or b or c)"),
+        ("a or b or true or c", "(a or b or true)"),
+        ("false or nil or a", "a"),
+        ("a and b and nil", "(a and b and nil)"),
+        ("a and 1 and b", "(a and b)"),
+    ],
+)
+def test_folds_constant_operands_of_logical_chains(source: str, folded: str) -> None:
+    def show(expr: Any) -> str:
+        if isinstance(expr, Variable):
+            return expr.name.lexeme
+        if isinstance(expr, Literal):
+            return {True: "true", None: "nil"}.get(expr.value, str(expr.value))
+        if isinstance(expr, Logical):
+            operands = [expr.left, expr.right]
+        else:
+            assert isinstance(expr, LogicalChain)
+            operands = expr.operands
+        joiner = f" {expr.operator.lexeme} "
+        return "(" + joiner.join(show(operand) for operand in operands) + ")"
+
+    assert show(folded_expression(source)) == folded
+
+
+def test_folds_operands_of_non_constant_expressions():
+    expr = folded_expression("a + 2 * 3")
+    assert isinstance(expr, Binary)
+    assert isinstance(expr.right, Literal)
+    assert expr.right.value == 6.0
+
+
+def test_removes_groupings():
+    expr = folded_expression("(a) * (b + (c))")
+    assert isinstance(expr, Binary)
+    assert isinstance(expr.left, Variable)
+    assert isinstance(expr.right, Binary)
+    assert isinstance(expr.right.right, Variable)
+
+
+def test_folded_program_prints_the_same(capfd: pytest.CaptureFixture[str]) -> None:
+    source = "for (var i = 0; i < 2; i = i + 1) print i * (2 + 3) - -0;"
+    Interpreter().interpret(Parser(Scanner(source).scan_tokens()).parse())
+    assert capfd.readouterr().out == "0\n5\n"
@@ -1,162 +1,158 @@
-from typing import List
+from typing import Any, Callable, List
 
+import pytest
 from hypothesis import given, settings
 from hypothesis import strategies as st
 
-from lox.expr import Binary, Grouping, Literal, Unary
+from lox.ast_printer import AstPrinter
+from lox.expr import (
+    Assign,
+    Binary,
+    Expr,
+    Grouping,
+    Literal,
+    Logical,
+    LogicalChain,
+    Unary,
+)
 from lox.parser import Parser
-from lox.stmt import Expression
+from lox.scanner import Scanner
+from lox.stmt import Block, Expression, Print, Stmt
 from lox.token import Token
 from lox.token_type import TokenType
 
+# Tokens are immutable, so generated token lists can all share these
+_BINARY_OPERATORS = (
+    Token(TokenType.PLUS, "+", None, 1),
+    Token(TokenType.MINUS, "-", None, 1),
+    Token(TokenType.STAR, "*", None, 1),
+    Token(TokenType.SLASH, "/", None, 1),
+)
+_UNARY_OPERATORS = (
+    Token(TokenType.MINUS, "-", None, 1),
+    Token(TokenType.BANG, "!", None, 1),
+)
+_LEFT_PAREN = Token(TokenType.LEFT_PAREN, "(", None, 1)
+_RIGHT_PAREN = Token(TokenType.RIGHT_PAREN, ")", None, 1)
+_SEMICOLON = Token(TokenType.SEMICOLON, ";", None, 1)
+_EOF = Token(TokenType.EOF, "", None, 1)
 
-@st.composite
-def simple_tokens(draw) -> Token:
+
+_LEXEMES = {
+    TokenType.MINUS: "-",
+    TokenType.PLUS: "+",
+    TokenType.SLASH: "/",
+    TokenType.STAR: "*",
+    TokenType.BANG: "!",
+    TokenType.EQUAL_EQUAL: "==",
+    TokenType.BANG_EQUAL: "!=",
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+    TokenType.LEFT_PAREN: "(",
+    TokenType.RIGHT_PAREN: ")",
+}
+_SIMPLE_TOKEN_TYPES = tuple(_LEXEMES)
+
+
+def simple_tokens() -> st.SearchStrategy[Token]:
     """Generate tokens for basic expressions."""
-    token_types = [
-        TokenType.MINUS,
-        TokenType.PLUS,
-        TokenType.SLASH,
-        TokenType.STAR,
-        TokenType.BANG,
-        TokenType.EQUAL_EQUAL,
-        TokenType.BANG_EQUAL,
-        TokenType.GREATER,
-        TokenType.GREATER_EQUAL,
-        TokenType.LESS,
-        TokenType.LESS_EQUAL,
-        TokenType.LEFT_PAREN,
-        TokenType.RIGHT_PAREN,
-    ]
-
-    token_type = draw(st.sampled_from(token_types))
-    # Notice we create the dictionary and assign the lexeme in the same line
-    lexeme = {
-        TokenType.MINUS: "-",
-        TokenType.PLUS: "+",
-        TokenType.SLASH: "/",
-        TokenType.STAR: "*",
-        TokenType.BANG: "!",
-        TokenType.EQUAL_EQUAL: "==",
-        TokenType.BANG_EQUAL: "!=",
-        TokenType.GREATER: ">",
-        TokenType.GREATER_EQUAL: ">=",
-        TokenType.LESS: "<",
-        TokenType.LESS_EQUAL: "<=",
-        TokenType.LEFT_PAREN: "(",
-        TokenType.RIGHT_PAREN: ")",
-    }[token_type]
-
-    line = draw(st.integers(min_value=1, max_value=10000))
-    return Token(token_type, lexeme, None, line)
-
-
-@st.composite
-def literal_tokens(draw) -> Token:
-    """Generate literal tokens."""
-    # Generate a literal value
-    literal_value = draw(
-        st.one_of(
-            st.none(),
-            st.booleans(),
-            st.floats(allow_nan=False, allow_infinity=False),
-            st.text(min_size=1, alphabet=st.characters(blacklist_categories=("Cs",))),
-        )
+    return st.builds(
+        lambda token_type, line: Token(token_type, _LEXEMES[token_type], None, line),
+        st.sampled_from(_SIMPLE_TOKEN_TYPES),
+        st.integers(min_value=1, max_value=10000),
     )
 
-    # Determine token type based on literal value
-    if literal_value is None:
-        return Token(TokenType.NIL, "nil", None, 1)
-    elif isinstance(literal_value, bool):
-        token_type = TokenType.TRUE if literal_value else TokenType.FALSE
-        lexeme = str(literal_value).lower()  # you can str() Python booleans!
-        return Token(token_type, lexeme, literal_value, 1)
-    elif isinstance(literal_value, float):
-        return Token(TokenType.NUMBER, str(literal_value), literal_value, 1)
-    else:  # string
-        return Token(TokenType.STRING, f'"{literal_value}"', literal_value, 1)
-
-
-@st.composite
-def valid_expression_stmts(draw) -> List[Token]:
-    """Generate token sequences that represent valid expression statements."""
 
-    def generate_expr(depth=0) -> List[Token]:
-        if depth > 5:  # Limit nesting depth
-            # Base case: just generate a literal
-            return [draw(literal_tokens())]
-
-        expr_type = draw(st.sampled_from(["literal", "binary", "unary", "grouping"]))
-
-        if expr_type == "literal":
-            return [draw(literal_tokens())]
-        elif expr_type == "binary":
-            # Generate left expr, operator, right expr
-            left = generate_expr(depth + 1)
-            op = draw(
-                st.sampled_from(
-                    [
-                        Token(TokenType.PLUS, "+", None, 1),
-                        Token(TokenType.MINUS, "-", None, 1),
-                        Token(TokenType.STAR, "*", None, 1),
-                        Token(TokenType.SLASH, "/", None, 1),
-                    ]
-                )
-            )
-            right = generate_expr(depth + 1)
-            # left and right are both lists: we use + to flatten and join them
-            # with the operator in between
-            return left + [op] + right
-        elif expr_type == "unary":
-            op = draw(
-                st.sampled_from(
-                    [
-                        Token(TokenType.MINUS, "-", None, 1),
-                        Token(TokenType.BANG, "!", None, 1),
-                    ]
-                )
-            )
-            expr = generate_expr(depth + 1)
-            return [op] + expr
-        else:  # grouping
-            expr = generate_expr(depth + 1)
-            return (
-                [Token(TokenType.LEFT_PAREN, "(", None, 1)]
-                + expr
-                + [Token(TokenType.RIGHT_PAREN, ")", None, 1)]
-            )
-
-    tokens = generate_expr()
-    tokens.append(Token(TokenType.SEMICOLON, ";", None, 1))
-    tokens.append(Token(TokenType.EOF, "", None, 1))
+def _boolean_token(value: bool) -> Token:
+    token_type = TokenType.TRUE if value else TokenType.FALSE
+    lexeme = str(value).lower()  # you can str() Python booleans!
+    return Token(token_type, lexeme, value, 1)
+
+
+# Each kind of literal value maps straight to its kind of token, so no draw
+# has to work out afterwards which kind of value it got. Built once here
+# rather than on every call of literal_tokens().
+_literal_tokens = st.one_of(
+    st.just(Token(TokenType.NIL, "nil", None, 1)),
+    st.booleans().map(_boolean_token),
+    st.floats(allow_nan=False, allow_infinity=False).map(
+        lambda value: Token(TokenType.NUMBER, str(value), value, 1)
+    ),
+    st.text(min_size=1, alphabet=st.characters(blacklist_categories=("Cs",))).map(
+        lambda value: Token(TokenType.STRING, f'"{value}"', value, 1)
+    ),
+)
+
+
+def literal_tokens() -> st.SearchStrategy[Token]:
+    """Generate literal tokens."""
+    return _literal_tokens
+
+
+# Expression trees, as nested tuples holding each subexpression's tokens and
+# subtrees in source order. Hypothesis builds and shrinks these itself, and
+# the leaf limit bounds their size instead of a nesting depth.
+_expression_trees = st.recursive(
+    literal_tokens(),
+    lambda operands: st.one_of(
+        st.tuples(operands, st.sampled_from(_BINARY_OPERATORS), operands),
+        st.tuples(st.sampled_from(_UNARY_OPERATORS), operands),
+        st.tuples(st.just(_LEFT_PAREN), operands, st.just(_RIGHT_PAREN)),
+    ),
+    max_leaves=16,
+)
+
+
+def _flatten_statement(tree: Any) -> List[Token]:
+    tokens: List[Token] = []
+    # Flatten the tree left to right. Tokens are tuples too, so check for them
+    # before treating a node as a subtree.
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Token):
+            tokens.append(node)
+        else:
+            stack.extend(reversed(node))
+
+    tokens.append(_SEMICOLON)
+    tokens.append(_EOF)
     return tokens
 
 
+def valid_expression_stmts() -> st.SearchStrategy[List[Token]]:
+    """Generate token sequences that represent valid expression statements."""
+    return _expression_trees.map(_flatten_statement)
+
+
 class TestParser:
-    def test_literal_expression(self):
-        """Test parsing of literal values."""
-        literals = [
+    @pytest.mark.parametrize(
+        "token,expected_value",
+        [
             (Token(TokenType.NUMBER, "123", 123.0, 1), 123.0),
             (Token(TokenType.STRING, '"hello"', "hello", 1), "hello"),
             (Token(TokenType.TRUE, "true", True, 1), True),
             (Token(TokenType.FALSE, "false", False, 1), False),
             (Token(TokenType.NIL, "nil", None, 1), None),
-        ]
-
-        for token, expected_value in literals:
-            parser = Parser(
-                [
-                    token,
-                    Token(TokenType.SEMICOLON, ";", None, 1),
-                    Token(TokenType.EOF, "", None, 1),
-                ]
-            )
-            statements = parser.parse()
-            assert isinstance(statements, list)
-            assert len(statements) == 1
-            assert isinstance(statements[0], Expression)
-            assert isinstance(statements[0].expression, Literal)
-            assert statements[0].expression.value == expected_value
+        ],
+    )
+    def test_literal_expression(self, token: Token, expected_value: Any) -> None:
+        """Test parsing of literal values."""
+        parser = Parser(
+            [
+                token,
+                Token(TokenType.SEMICOLON, ";", None, 1),
+                Token(TokenType.EOF, "", None, 1),
+            ]
+        )
+        statements = parser.parse()
+        assert isinstance(statements, list)
+        assert len(statements) == 1
+        assert isinstance(statements[0], Expression)
+        assert isinstance(statements[0].expression, Literal)
+        assert statements[0].expression.value == expected_value
 
     def test_grouping_expression(self):
         """Test parsing of grouped expressions."""
@@ -239,10 +235,10 @@ class TestParser:
         assert isinstance(expr.right, Binary)
         assert expr.right.operator.type == TokenType.STAR
 
-    def test_comparison_expressions(self):
-        """Test parsing of comparison expressions and their precedence."""
-        # Test cases with expected AST structure:
-        cases = [
+    @pytest.mark.parametrize(
+        "tokens,validator",
+        [
+            # Test cases with expected AST structure:
             # Simple comparison: 1 < 2
             (
                 [
@@ -308,13 +304,119 @@ class TestParser:
                     and isinstance(stmts[0].expression.right.right, Literal)
                 ),
             ),
-        ]
+        ],
+    )
+    def test_comparison_expressions(
+        self, tokens: List[Token], validator: Callable[[List[Stmt]], bool]
+    ) -> None:
+        """Test parsing of comparison expressions and their precedence."""
+        parser = Parser(tokens)
+        expr = parser.parse()
+        assert expr is not None, "Parser returned None"
+        assert validator(expr), f"Invalid expression for tokens: {tokens}"
+
+    def test_logical_chains(self):
+        """Runs of the same logical operator are parsed into one flat node."""
+
+        def parse_expression(types: List[TokenType]) -> Expr:
+            tokens = [Token(type_, "", None, 1) for type_ in types]
+            tokens += [
+                Token(TokenType.SEMICOLON, ";", None, 1),
+                Token(TokenType.EOF, "", None, 1),
+            ]
+            (statement,) = Parser(tokens).parse()
+            assert isinstance(statement, Expression)
+            return statement.expression
 
-        for tokens, validator in cases:
-            parser = Parser(tokens)
-            expr = parser.parse()
-            assert expr is not None, "Parser returned None"
-            assert validator(expr), f"Invalid expression for tokens: {tokens}"
+        pair = parse_expression([TokenType.TRUE, TokenType.OR, TokenType.FALSE])
+        assert isinstance(pair, Logical)
+
+        chain = parse_expression(
+            [
+                TokenType.TRUE,
+                TokenType.OR,
+                TokenType.FALSE,
+                TokenType.AND,
+                TokenType.NIL,
+                TokenType.AND,
+                TokenType.TRUE,
+                TokenType.OR,
+                TokenType.NIL,
+            ]
+        )
+        # and binds tighter: true or (false and nil and true) or nil
+        assert isinstance(chain, LogicalChain)
+        assert chain.operator.type == TokenType.OR
+        assert len(chain.operands) == 3
+        middle = chain.operands[1]
+        assert isinstance(middle, LogicalChain)
+        assert middle.operator.type == TokenType.AND
+        assert len(middle.operands) == 3
+
+    @pytest.mark.parametrize(
+        "source,expected",
+        [
+            ("1 - 2 - 3;", "(- (- 1.0 2.0) 3.0)"),
+            ("8 / 4 * 2;", "(* (/ 8.0 4.0) 2.0)"),
+            ("1 + 2 * 3 - 4;", "(- (+ 1.0 (* 2.0 3.0)) 4.0)"),
+            ("1 < 2 == 3 >= 4;", "(== (< 1.0 2.0) (>= 3.0 4.0))"),
+            ("-1 * 2 != !3 + 4 <= 5;", "(!= (* (- 1.0) 2.0) (<= (+ (! 3.0) 4.0) 5.0))"),
+            ("1 == 2 != 3;", "(!= (== 1.0 2.0) 3.0)"),
+        ],
+    )
+    def test_binary_precedence_and_associativity(
+        self, source: str, expected: str
+    ) -> None:
+        """Every binary level binds as in the grammar and associates left."""
+        (statement,) = Parser(Scanner(source).scan_tokens()).parse()
+        assert isinstance(statement, Expression)
+        assert AstPrinter().print(statement.expression) == expected
+
+    def test_right_associative_chains(self):
+        """Assignments and unary operators nest to the right."""
+        (statement,) = Parser(Scanner("a = b = -!-1;").scan_tokens()).parse()
+        assert isinstance(statement, Expression)
+        outer = statement.expression
+        assert isinstance(outer, Assign)
+        assert outer.name.lexeme == "a"
+        inner = outer.value
+        assert isinstance(inner, Assign)
+        assert inner.name.lexeme == "b"
+        assert AstPrinter().print(inner.value) == "(- (! (- 1.0)))"
+
+    def test_invalid_assignment_target_in_chain(self):
+        """Only the invalid target is dropped from a chain of assignments."""
+        (statement,) = Parser(Scanner("a = (b) = c;").scan_tokens()).parse()
+        assert isinstance(statement, Expression)
+        assign = statement.expression
+        assert isinstance(assign, Assign)
+        assert isinstance(assign.value, Grouping)
+
+    def test_literals_are_shared(self):
+        """Equal literals in one program are parsed into the same node."""
+        tokens = [
+            Token(TokenType.NUMBER, "1", 1.0, 1),
+            Token(TokenType.PLUS, "+", None, 1),
+            Token(TokenType.NUMBER, "1", 1.0, 1),
+            Token(TokenType.EQUAL_EQUAL, "==", None, 1),
+            Token(TokenType.TRUE, "true", True, 1),
+            Token(TokenType.SEMICOLON, ";", None, 1),
+            Token(TokenType.NIL, "nil", None, 1),
+            Token(TokenType.SEMICOLON, ";", None, 1),
+            Token(TokenType.EOF, "", None, 1),
+        ]
+        first, second = Parser(tokens).parse()
+        assert isinstance(first, Expression) and isinstance(second, Expression)
+        equality = first.expression
+        assert isinstance(equality, Binary)
+        addition = equality.left
+        assert isinstance(addition, Binary)
+        assert addition.left is addition.right
+        # 1.0 == True in Python, but the number and the boolean stay distinct
+        assert isinstance(equality.right, Literal)
+        assert equality.right.value is True
+        assert isinstance(second.expression, Literal)
+        assert second.expression.value is None
 
     def test_error_handling(self):
         """Test parser error handling."""
@@ -331,6 +433,13 @@ class TestParser:
         # All ParseErrors means an empty list is returned
         assert len(statements) == 0
 
+    def test_block_leaves_out_declarations_with_errors(self):
+        """Like the top level, a block keeps only declarations that parsed."""
+        (block,) = Parser(Scanner("{ print; print 1; }").scan_tokens()).parse()
+        assert isinstance(block, Block)
+        (statement,) = block.statements
+        assert isinstance(statement, Print)
+
     @given(valid_expression_stmts())
     @settings(max_examples=100)
     def test_parser_with_valid_expression_stmts(self, tokens):
@@ -0,0 +1,272 @@
+from typing import List
+
+import pytest
+
+from lox import lox_callable
+from lox.expr import Assign, Binary, Variable
+from lox.interpreter import Interpreter
+from lox.lox_callable import LoxFunction
+from lox.parser import Parser
+from lox.resolver import Resolver
+from lox.scanner import Scanner
+from lox.stmt import Block, Expression, Function, Print, Stmt, Var
+
+
+def resolve(source: str) -> List[Stmt]:
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver().resolve(statements)
+    return statements
+
+
+def run(source: str, capfd: pytest.CaptureFixture[str]) -> str:
+    Interpreter().interpret(Parser(Scanner(source).scan_tokens()).parse())
+    return capfd.readouterr().out
+
+
+def run_function(source: str, name: str = "f") -> LoxFunction:
+    """Run a program and return the global function it declared as name."""
+    interpreter = Interpreter()
+    interpreter.interpret(Parser(Scanner(source).scan_tokens()).parse())
+    values = interpreter.globals.values
+    assert values is not None
+    function = values[name]
+    assert isinstance(function, LoxFunction)
+    return function
+
+
+@pytest.fixture
+def memoize(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Turn on caching of pure functions' results, as LOX_MEMOIZE=1 does."""
+    monkeypatch.setattr(lox_callable, "_MEMOIZE", True)
+
+
+def test_globals_are_left_unresolved():
+    var, printed = resolve("var a = 1; print a;")
+    assert isinstance(var, Var) and isinstance(printed, Print)
+    assert var.slot is None
+    assert isinstance(printed.expression, Variable)
+    assert printed.expression.depth is None
+
+
+def test_locals_get_slots_in_declaration_order():
+    (block,) = resolve("{ var a = 1; var b = 2; print b; }")
+    assert isinstance(block, Block)
+    a, b, printed = block.statements
+    assert isinstance(a, Var) and isinstance(b, Var)
+    assert (a.slot, b.slot) == (0, 1)
+    assert block.slot_count == 2
+    assert isinstance(printed, Print)
+    assert isinstance(printed.expression, Variable)
+    assert (printed.expression.depth, printed.expression.slot) == (0, 1)
+
+
+def test_depth_counts_enclosing_scopes():
+    (outer,) = resolve("{ var a = 1; { { a = 2; } } }")
+    assert isinstance(outer, Block)
+    middle = outer.statements[1]
+    assert isinstance(middle, Block)
+    inner = middle.statements[0]
+    assert isinstance(inner, Block)
+    statement = inner.statements[0]
+    assert isinstance(statement, Expression)
+    assign = statement.expression
+    assert isinstance(assign, Assign)
+    assert (assign.depth, assign.slot) == (2, 0)
+
+
+def test_parameters_come_before_body_locals():
+    (function,) = resolve("fun f(a, b) { var c = a + b; return c; }")
+    assert isinstance(function, Function)
+    assert function.slot is None
+    assert function.slot_count == 3
+    var = function.body[0]
+    assert isinstance(var, Var)
+    assert var.slot == 2
+    assert isinstance(var.initializer, Binary)
+    left = var.initializer.left
+    assert isinstance(left, Variable)
+    assert (left.depth, left.slot) == (0, 0)
+
+
+def test_initializer_is_resolved_before_the_name_is_declared():
+    (block,) = resolve("{ var a = a; }")
+    assert isinstance(block, Block)
+    var = block.statements[0]
+    assert isinstance(var, Var)
+    assert isinstance(var.initializer, Variable)
+    assert var.initializer.depth is None
+
+
+def test_redeclaration_reuses_the_slot():
+    (block,) = resolve("{ var a = 1; var a = 2; }")
+    assert isinstance(block, Block)
+    assert [stmt.slot for stmt in block.statements if isinstance(stmt, Var)] == [
+        0,
+        0,
+    ]
+    assert block.slot_count == 1
+
+
+def test_closures_bind_to_the_declaration_in_scope(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    source = """
+    var a = "global";
+    {
+      fun showA() {
+        print a;
+      }
+      showA();
+      var a = "block";
+      showA();
+      print a;
+    }
+    """
+    assert run(source, capfd) == "global\nglobal\nblock\n"
+
+
+def test_local_functions_cant_call_later_local_functions(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    # g isn't declared yet where f is, so f's call to g resolves to a global,
+    # as in the book. Before locals were resolved to slots, names were looked
+    # up when the call ran, and this printed 1.
+    source = "{ fun f() { return g(); } fun g() { return 1; } print f(); }"
+    Interpreter().interpret(Parser(Scanner(source).scan_tokens()).parse())
+    captured = capfd.readouterr()
+    assert captured.out == ""
+    assert "Undefined variable 'g'." in captured.err
+
+
+def test_own_initializer_reads_outer_variable(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    assert run("var a = 1; { var a = a + 2; print a; }", capfd) == "3\n"
+
+
+def test_local_recursion(capfd: pytest.CaptureFixture[str]) -> None:
+    source = """
+    {
+      fun fact(n) {
+        if (n <= 1) return 1;
+        return n * fact(n - 1);
+      }
+      print fact(5);
+    }
+    """
+    assert run(source, capfd) == "120\n"
+
+
+def test_functions_with_nested_declarations_have_closures():
+    outer, leaf = resolve(
+        "fun outer() { { fun inner() { fun innermost() {} } } } fun leaf(a) {}"
+    )
+    assert isinstance(outer, Function) and isinstance(leaf, Function)
+    inner = outer.body[0].statements[0]
+    assert outer.has_closures
+    assert inner.has_closures
+    assert not inner.body[0].has_closures
+    assert not leaf.has_closures
+
+
+def test_reused_call_scopes_keep_calls_independent(
+    capfd: pytest.CaptureFixture[str],
+) -> None:
+    source = """
+    fun sum(n) {
+      var total = n;
+      if (n > 0) total = total + sum(n - 1);
+      return total;
+    }
+    print sum(3);
+    print sum(2);
+    fun counter() {
+      var count = 0;
+      fun increment() { count = count + 1; return count; }
+      return increment;
+    }
+    var a = counter();
+    var b = counter();
+    a(); a();
+    print a();
+    print b();
+    """
+    assert run(source, capfd) == "6\n3\n3\n1\n"
+
+
+def test_pooled_call_scopes_are_cleared_and_capped(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lox_callable, "_FRAMES_SIZE", 2)
+    function = run_function(
+        'fun f(n) { var s = "big"; if (n > 0) f(n - 1); return s; } f(5);'
+    )
+    assert function.frames is not None
+    assert len(function.frames) == 2
+    for frame in function.frames:
+        assert frame.slots == [None, None]
+
+
+@pytest.mark.parametrize(
+    "source,is_pure",
+    [
+        ("fun f(n) { var m = n * 2; { var k = m; return k + n; } }", True),
+        ("fun f(n) { if (n < 2) return n; return f(n - 1) + f(n - 2); }", True),
+        ("fun f(n) { print n; }", False),
+        ("fun f() { return clock(); }", False),
+        ("var g = 1; fun f(n) { return n + g; }", False),
+        ("var g = 1; fun f(n) { g = n; }", False),
+        ("fun f(n) { fun h() {} return n; }", False),
+        ("fun f(f) { return f(1); }", False),
+        ("fun f() { var g = f; return g; }", True),
+        ("fun f() { var g = f; return g(); }", False),
+    ],
+)
+def test_purity(source: str, is_pure: bool) -> None:
+    function = [stmt for stmt in resolve(source) if isinstance(stmt, Function)][-1]
+    assert function.is_pure == is_pure
+
+
+def test_closures_over_outer_variables_are_impure():
+    (outer,) = resolve("fun outer(a) { fun inner() { return a; } return inner; }")
+    assert isinstance(outer, Function)
+    inner = outer.body[0]
+    assert isinstance(inner, Function)
+    assert not outer.is_pure
+    assert not inner.is_pure
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        (
+            "fun fib(n) { if (n < 2) return n; return fib(n - 2) + fib(n - 1); }"
+            "print fib(60);",
+            "1548008755920\n",
+        ),
+        ("fun f(a) { return a; } print f(1); print f(true);", "1\ntrue\n"),
+        ("fun f(a) { return -a; } print f(0); print f(-0);", "-0\n0\n"),
+        (
+            "fun f(n) { if (n < 1) return 0; return f(n - 1) + 1; }"
+            "print f(3); var g = f; fun f(n) { return 100; } print g(3);",
+            "3\n101\n",
+        ),
+    ],
+)
+@pytest.mark.usefixtures("memoize")
+def test_pure_function_results_are_cached_safely(
+    source: str, expected: str, capfd: pytest.CaptureFixture[str]
+) -> None:
+    assert run(source, capfd) == expected
+
+
+def test_pure_function_results_are_only_cached_when_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    source = "fun f(n) { return n; } f(1); f(2); f(1); f(3);"
+    assert run_function(source).memo is None
+
+    monkeypatch.setattr(lox_callable, "_MEMOIZE", True)
+    monkeypatch.setattr(lox_callable, "_MEMO_SIZE", 2)
+    # f(1) was used more recently than f(2), so f(2) is evicted for f(3)
+    assert list(run_function(source).memo or {}) == [("1.0",), ("3.0",)]
@@ -1,3 +1,6 @@
+from typing import List
+
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -6,34 +9,45 @@ from lox.token_type import TokenType
 
 
 class TestScanner:
-    def test_empty_source(self) -> None:
-        scanner = Scanner("")
-        tokens = scanner.scan_tokens()
-        assert len(tokens) == 1
-        assert tokens[0].type == TokenType.EOF
-
-    def test_single_character_tokens(self) -> None:
-        source = "(){},.-+;*"
+    @pytest.mark.parametrize(
+        "source,expected_types",
+        [
+            ("", [TokenType.EOF]),
+            (
+                "(){},.-+;*",
+                [
+                    TokenType.LEFT_PAREN,
+                    TokenType.RIGHT_PAREN,
+                    TokenType.LEFT_BRACE,
+                    TokenType.RIGHT_BRACE,
+                    TokenType.COMMA,
+                    TokenType.DOT,
+                    TokenType.MINUS,
+                    TokenType.PLUS,
+                    TokenType.SEMICOLON,
+                    TokenType.STAR,
+                    TokenType.EOF,
+                ],
+            ),
+            (
+                "var myVar = true;",
+                [
+                    TokenType.VAR,
+                    TokenType.IDENTIFIER,
+                    TokenType.EQUAL,
+                    TokenType.TRUE,
+                    TokenType.SEMICOLON,
+                    TokenType.EOF,
+                ],
+            ),
+        ],
+        ids=["empty_source", "single_character_tokens", "identifiers_and_keywords"],
+    )
+    def test_token_types(self, source: str, expected_types: List[TokenType]) -> None:
         scanner = Scanner(source)
         tokens = scanner.scan_tokens()
 
-        expected_types = [
-            TokenType.LEFT_PAREN,
-            TokenType.RIGHT_PAREN,
-            TokenType.LEFT_BRACE,
-            TokenType.RIGHT_BRACE,
-            TokenType.COMMA,
-            TokenType.DOT,
-            TokenType.MINUS,
-            TokenType.PLUS,
-            TokenType.SEMICOLON,
-            TokenType.STAR,
-            TokenType.EOF,
-        ]
-
-        assert len(tokens) == len(expected_types)
-        for token, expected_type in zip(tokens, expected_types, strict=False):
-            assert token.type == expected_type
+        assert [token.type for token in tokens] == expected_types
 
     # Exclude surrogate code points
     @given(st.text(alphabet=st.characters(blacklist_categories=("Cs",))))
@@ -62,23 +76,18 @@ class TestScanner:
         assert tokens[0].type == TokenType.NUMBER
         assert tokens[0].literal == 123.45
 
-    def test_identifiers_and_keywords(self) -> None:
-        source = "var myVar = true;"
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
+    def test_identifiers_are_interned(self) -> None:
+        source = "counter = counter + 1;"
+        tokens = Scanner(source).scan_tokens()
 
-        expected_types = [
-            TokenType.VAR,
-            TokenType.IDENTIFIER,
-            TokenType.EQUAL,
-            TokenType.TRUE,
-            TokenType.SEMICOLON,
-            TokenType.EOF,
-        ]
+        # Both uses of the name share one string object
+        assert tokens[0].lexeme is tokens[2].lexeme
+
+    def test_tokens_print_their_type_by_name(self) -> None:
+        (token, _) = Scanner("+").scan_tokens()
 
-        assert len(tokens) == len(expected_types)
-        for token, expected_type in zip(tokens, expected_types, strict=False):
-            assert token.type == expected_type
+        # TokenType is an IntEnum, but prints like a plain Enum
+        assert str(token) == "TokenType.PLUS + None"
 
     def test_comments(self) -> None:
         source = "// This is a comment\n123"
@@ -88,3 +97,16 @@ class TestScanner:
         assert len(tokens) == 2  # Number token + EOF
         assert tokens[0].type == TokenType.NUMBER
         assert tokens[0].literal == 123.0
+
+    def test_strings_and_comments_track_lines(self) -> None:
+        source = '"one\ntwo" // comment\nnamé_2 1.5.x'
+        tokens = Scanner(source).scan_tokens()
+
+        assert [(t.type, t.lexeme, t.line) for t in tokens] == [
+            (TokenType.STRING, '"one\ntwo"', 2),
+            (TokenType.IDENTIFIER, "namé_2", 3),
+            (TokenType.NUMBER, "1.5", 3),
+            (TokenType.DOT, ".", 3),
+            (TokenType.IDENTIFIER, "x", 3),
+            (TokenType.EOF, "", 3),
+        ]